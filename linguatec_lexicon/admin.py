@@ -12,15 +12,87 @@ def custom_titled_filter(title):
     return Wrapper
 
 
+class RenderedWordAdminMixin:
+    """
+    Render again the words modified using the admin (see RenderedWord)
+    which increases the data version of their lexicons too.
+    """
+    # lookup from the model to the Word primary key
+    word_lookup = 'pk'
+
+    def get_word_ids(self, queryset):
+        return set(queryset.values_list(self.word_lookup, flat=True))
+
+    def get_lexicon_ids(self, word_ids):
+        return set(models.Word.objects.filter(pk__in=word_ids).values_list('lexicon_id', flat=True))
+
+    def rebuild_rendered_words(self, word_ids, lexicon_ids=None):
+        models.RenderedWord.objects.rebuild(models.Word.objects.filter(pk__in=word_ids))
+        # data version of deleted words can't be increased by rebuild
+        if lexicon_ids:
+            models.Lexicon.objects.bump_data_version(lexicon_ids)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        self.rebuild_rendered_words(self.get_word_ids(self.model.objects.filter(pk=form.instance.pk)))
+
+    def delete_model(self, request, obj):
+        word_ids = self.get_word_ids(self.model.objects.filter(pk=obj.pk))
+        lexicon_ids = self.get_lexicon_ids(word_ids)
+        super().delete_model(request, obj)
+        self.rebuild_rendered_words(word_ids, lexicon_ids)
+
+    def delete_queryset(self, request, queryset):
+        word_ids = self.get_word_ids(queryset)
+        lexicon_ids = self.get_lexicon_ids(word_ids)
+        super().delete_queryset(request, queryset)
+        self.rebuild_rendered_words(word_ids, lexicon_ids)
+
+
+class DataVersionAdminMixin:
+    """
+    Increase data version of lexicons when the model is modified using the admin.
+    Words which include the model on their rendered content are rendered again.
+    """
+    # lookup from the model to the Word primary key (None if it isn't rendered)
+    word_lookup = None
+
+    def get_word_ids(self, queryset):
+        if self.word_lookup is None:
+            return set()
+        return set(queryset.filter(**{self.word_lookup + '__isnull': False}).values_list(
+            self.word_lookup, flat=True))
+
+    def update_data_version(self, word_ids):
+        if word_ids:
+            models.RenderedWord.objects.rebuild(models.Word.objects.filter(pk__in=word_ids))
+        models.Lexicon.objects.bump_data_version()
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self.update_data_version(self.get_word_ids(self.model.objects.filter(pk=obj.pk)))
+
+    def delete_model(self, request, obj):
+        word_ids = self.get_word_ids(self.model.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        self.update_data_version(word_ids)
+
+    def delete_queryset(self, request, queryset):
+        word_ids = self.get_word_ids(queryset)
+        super().delete_queryset(request, queryset)
+        self.update_data_version(word_ids)
+
+
 @admin.register(models.Lexicon)
-class LexiconAdmin(admin.ModelAdmin):
+class LexiconAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'src_language', 'dst_language',)
     search_fields = ('name',)
     list_filter = ('src_language', 'dst_language',)
 
 
 @admin.register(models.GramaticalCategory)
-class GramaticalCategoryAdmin(admin.ModelAdmin):
+class GramaticalCategoryAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    word_lookup = 'entries__word'
     list_display = ('abbreviation', 'title',)
 
 
@@ -31,7 +103,7 @@ class EntryInline(admin.TabularInline):
 
 
 @admin.register(models.Word)
-class WordAdmin(admin.ModelAdmin):
+class WordAdmin(RenderedWordAdminMixin, admin.ModelAdmin):
     list_display = ('term', 'lexicon',)
     search_fields = ('term',)
     list_filter = (('lexicon__name', custom_titled_filter('Lexicon name')),
@@ -53,7 +125,8 @@ class VerbalConjugationInline(admin.StackedInline):
 
 
 @admin.register(models.Entry)
-class EntryAdmin(admin.ModelAdmin):
+class EntryAdmin(RenderedWordAdminMixin, admin.ModelAdmin):
+    word_lookup = 'word'
     list_display = ('word', 'translation', 'variation')
     search_fields = ('word__term',)
     list_filter = ('word__lexicon',
@@ -70,19 +143,31 @@ class EntryAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Example)
-class ExampleAdmin(admin.ModelAdmin):
+class ExampleAdmin(RenderedWordAdminMixin, admin.ModelAdmin):
+    word_lookup = 'entry__word'
     list_display = ('phrase', 'entry',)
     search_fields = ('entry__word__term',)
     list_filter = (('entry__word__lexicon', custom_titled_filter('Lexicon name')),
                    'entry__word__lexicon__src_language',
                    'entry__word__lexicon__dst_language',)
 
+    list_select_related = ('entry',)
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        # search words of the phrase too (backed by a trigram index)
+        if search_term:
+            results |= queryset.filter(pk__in=self.model.objects.search_phrase(search_term).values('pk'))
+        return results, may_have_duplicates
+
 
 @admin.register(models.Region)
-class RegionAdmin(admin.ModelAdmin):
+class RegionAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    word_lookup = 'variations__entries__word'
     list_display = ('name',)
 
 
 @admin.register(models.DiatopicVariation)
-class DiatopicVariationAdmin(admin.ModelAdmin):
+class DiatopicVariationAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    word_lookup = 'entries__word'
     list_display = ('name',)
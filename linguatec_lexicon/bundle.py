@@ -0,0 +1,167 @@
+"""
+Offline bundles: a standalone SQLite database with the data of a
+lexicon that apps can download and query without the API.
+
+Bundles are built by the `buildbundle` command and named after the
+data version of the lexicon, so clients can tell whether theirs is up
+to date. Configure where they are stored on the project settings:
+    LINGUATEC_LEXICON_BUNDLE_DIR = os.path.join(MEDIA_ROOT, 'bundles')
+
+"""
+import datetime
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+
+from .models import Entry, Example, GramaticalCategory, Label, Lexicon, VerbalConjugation
+
+# increase it when the schema changes
+BUNDLE_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE gramcats (id INTEGER PRIMARY KEY, abbreviation TEXT NOT NULL, title TEXT NOT NULL);
+CREATE TABLE variations (id INTEGER PRIMARY KEY, name TEXT NOT NULL, abbreviation TEXT NOT NULL, region TEXT NOT NULL);
+CREATE TABLE labels (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY, term TEXT NOT NULL, slug TEXT NOT NULL, normalized_term TEXT NOT NULL
+);
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY, word_id INTEGER NOT NULL, variation_id INTEGER,
+    translation TEXT NOT NULL, marked_translation TEXT NOT NULL
+);
+CREATE TABLE entry_gramcats (entry_id INTEGER NOT NULL, gramcat_id INTEGER NOT NULL);
+CREATE TABLE entry_labels (entry_id INTEGER NOT NULL, label_id INTEGER NOT NULL);
+CREATE TABLE examples (id INTEGER PRIMARY KEY, entry_id INTEGER NOT NULL, phrase TEXT NOT NULL);
+CREATE TABLE conjugations (
+    entry_id INTEGER PRIMARY KEY, raw TEXT NOT NULL, parsed TEXT, model_word_id INTEGER
+);
+-- full text search of terms and translations (rowid is the id of the word)
+CREATE VIRTUAL TABLE words_fts USING fts5(
+    term, translations, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+INDEXES = """
+CREATE INDEX words_normalized_term ON words (normalized_term);
+CREATE INDEX words_slug ON words (slug);
+CREATE INDEX entries_word ON entries (word_id);
+CREATE INDEX entry_gramcats_entry ON entry_gramcats (entry_id);
+CREATE INDEX entry_labels_entry ON entry_labels (entry_id);
+CREATE INDEX examples_entry ON examples (entry_id);
+"""
+
+
+def get_bundle_dir():
+    return getattr(settings, 'LINGUATEC_LEXICON_BUNDLE_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'bundles')
+
+
+def get_bundle_path(lexicon, version):
+    return os.path.join(get_bundle_dir(), '{}-{}.sqlite3'.format(lexicon.slug, version))
+
+
+def list_bundles(lexicon):
+    """Return the available bundles of the lexicon as a {version: path} dict."""
+    pattern = re.compile(r'{}-(\d+)\.sqlite3'.format(re.escape(lexicon.slug)))
+    try:
+        filenames = os.listdir(get_bundle_dir())
+    except FileNotFoundError:
+        return {}
+
+    bundles = {}
+    for filename in filenames:
+        match = pattern.fullmatch(filename)
+        if match:
+            bundles[int(match.group(1))] = os.path.join(get_bundle_dir(), filename)
+    return bundles
+
+
+def get_current_version(lexicon):
+    # the cached lexicon may be outdated
+    return Lexicon.objects.filter(pk=lexicon.pk).values_list('data_version', flat=True).get()
+
+
+def build_bundle(lexicon, data_version, path):
+    """
+    Write the data of the lexicon to a new SQLite database on path
+    (replaced atomically once it is complete) and return the number
+    of rows of each table.
+    """
+    entries = Entry.objects.filter(word__lexicon=lexicon)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix='.sqlite3', dir=directory)
+    os.close(fd)
+
+    counts = {}
+    try:
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+
+            def insert(table, rows):
+                columns = len(db.execute('SELECT * FROM {} LIMIT 0'.format(table)).description)
+                sql = 'INSERT INTO {} VALUES ({})'.format(table, ','.join('?' * columns))
+                counts[table] = db.executemany(sql, rows).rowcount
+
+            insert('meta', [
+                ('format', str(BUNDLE_FORMAT)),
+                ('lexicon', lexicon.slug),
+                ('name', lexicon.name),
+                ('src_language', lexicon.src_language),
+                ('dst_language', lexicon.dst_language),
+                ('data_version', str(data_version)),
+                ('built', datetime.datetime.now(datetime.timezone.utc).isoformat()),
+            ])
+            insert('gramcats', GramaticalCategory.objects.values_list('id', 'abbreviation', 'title').iterator())
+            insert('variations', entries.filter(variation__isnull=False).order_by().values_list(
+                'variation_id', 'variation__name', 'variation__abbreviation', 'variation__region__name').distinct())
+            insert('labels', lexicon.labels.values_list('id', 'name').iterator())
+            insert('words', lexicon.words.values_list('id', 'term', 'slug', 'normalized_term').iterator())
+
+            translations = defaultdict(list)
+
+            def entry_rows():
+                for row in entries.values_list(
+                        'id', 'word_id', 'variation_id', 'translation', 'marked_translation').iterator():
+                    translations[row[1]].append(row[3])
+                    yield row
+
+            insert('entries', entry_rows())
+            insert('entry_gramcats', Entry.gramcats.through.objects.filter(
+                entry__word__lexicon=lexicon).values_list('entry_id', 'gramaticalcategory_id').iterator())
+            insert('entry_labels', Label.entries.through.objects.filter(
+                label__lexicon=lexicon).values_list('entry_id', 'label_id').iterator())
+            insert('examples', Example.objects.filter(
+                entry__word__lexicon=lexicon).values_list('id', 'entry_id', 'phrase').iterator())
+            insert('conjugations', (
+                (entry_id, raw, json.dumps(parsed) if parsed is not None else None, model_word_id)
+                for entry_id, raw, parsed, model_word_id in VerbalConjugation.objects.filter(
+                    entry__word__lexicon=lexicon).values_list(
+                        'entry_id', 'raw', 'parsed', 'model_word_ref_id').iterator()
+            ))
+            db.executemany(
+                'INSERT INTO words_fts (rowid, term, translations) VALUES (?, ?, ?)',
+                ((word_id, term, '\n'.join(translations[word_id]))
+                 for word_id, term in lexicon.words.values_list('id', 'term').iterator()),
+            )
+
+            db.executescript(INDEXES)
+            db.execute("INSERT INTO words_fts (words_fts) VALUES ('optimize')")
+            db.commit()
+            db.execute('ANALYZE')
+            db.execute('VACUUM')
+        finally:
+            db.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return counts
@@ -0,0 +1,133 @@
+"""
+Caches used to serve the API.
+
+ResponseCache: API responses shared by the processes serving the API.
+
+Configure it on the project settings:
+    LINGUATEC_LEXICON_RESPONSE_CACHE = 'default'    # alias of CACHES (None, the default, disables it)
+    LINGUATEC_LEXICON_RESPONSE_CACHE_TIMEOUT = 86400
+
+The cache should be shared by the processes (e.g. memcached): it is
+disabled by default because the local memory cache isn't.
+
+Keys include the data version of the lexicons so cached responses
+are not used anymore when the data is updated (see DataVersionMixin).
+
+TermIndexCache: sorted terms of each lexicon kept in memory of each
+process to complete prefixes without querying the database.
+
+"""
+import bisect
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.http import urlencode
+
+
+class ResponseCache:
+    KEY_PREFIX = 'linguatec_lexicon:response'
+    COUNTERS = ('hits', 'misses')
+    # backends whose content isn't shared with other processes
+    PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+    @property
+    def cache(self):
+        alias = getattr(settings, 'LINGUATEC_LEXICON_RESPONSE_CACHE', None)
+        return caches[alias] if alias is not None else None
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'LINGUATEC_LEXICON_RESPONSE_CACHE_TIMEOUT', 86400)
+
+    @property
+    def enabled(self):
+        return self.cache is not None
+
+    @property
+    def is_process_local(self):
+        return isinstance(self.cache, self.PROCESS_LOCAL_BACKENDS)
+
+    def make_key(self, name, params, version):
+        """
+        Build the key of the response of an endpoint (name) for
+        the query params and the data version.
+        """
+        data = '{}|{}|{}'.format(name, urlencode(sorted(params.items())), version)
+        return '{}:{}'.format(self.KEY_PREFIX, hashlib.md5(data.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        """Return the cached (content_type, content) or None (and count it)."""
+        value = self.cache.get(key)
+        self.incr('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, content_type, content):
+        self.cache.set(key, (content_type, content), timeout=self.timeout)
+
+    def incr(self, counter):
+        key = '{}:{}'.format(self.KEY_PREFIX, counter)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # evicted meanwhile
+            self.cache.set(key, 1, timeout=None)
+
+    def stats(self):
+        keys = ['{}:{}'.format(self.KEY_PREFIX, counter) for counter in self.COUNTERS]
+        values = self.cache.get_many(keys)
+        return {counter: values.get(key, 0) for counter, key in zip(self.COUNTERS, keys)}
+
+    def reset_stats(self):
+        self.cache.delete_many(['{}:{}'.format(self.KEY_PREFIX, counter) for counter in self.COUNTERS])
+
+
+response_cache = ResponseCache()
+
+
+class TermIndex:
+    """Sorted normalized terms of a lexicon to look up them by prefix."""
+
+    def __init__(self, words):
+        # words are (normalized_term, term, slug) tuples
+        self.words = sorted(words)
+        self.keys = [word[0] for word in self.words]
+
+    def __len__(self):
+        return len(self.words)
+
+    def complete(self, prefix, limit=10):
+        """Return (term, slug) of the first words starting with prefix."""
+        results = []
+        start = bisect.bisect_left(self.keys, prefix)
+        for normalized_term, term, slug in self.words[start:start + limit]:
+            if not normalized_term.startswith(prefix):
+                break
+            results.append((term, slug))
+        return results
+
+
+class TermIndexCache:
+    """
+    TermIndex of each lexicon, built on first use and built again
+    when the data version of the lexicon changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexes = {}
+
+    def get(self, lexicon, data_version):
+        with self.lock:
+            version, index = self.indexes.get(lexicon.pk, (None, None))
+            if index is None or version != data_version:
+                index = TermIndex(lexicon.words.values_list('normalized_term', 'term', 'slug').iterator())
+                self.indexes[lexicon.pk] = (data_version, index)
+        return index
+
+
+term_index_cache = TermIndexCache()
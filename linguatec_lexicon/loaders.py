@@ -0,0 +1,134 @@
+"""
+Loaders used by the import commands to insert the objects in bulk.
+
+ORMLoader: bulk_create (batches of INSERT queries), any database.
+CopyLoader: PostgreSQL COPY FROM STDIN streaming the rows from an
+in-memory buffer. Primary keys are reserved from the sequence of the
+table beforehand, so objects get them as they do with bulk_create.
+
+"""
+import io
+import json
+
+from django.db import connections, models
+
+from .models import Word, WordToken
+
+# escape sequences of COPY text format
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+COPY_NULL = '\\N'
+
+
+class ORMLoader:
+    name = 'orm'
+
+    def __init__(self, batch_size=500, using='default'):
+        self.batch_size = batch_size
+        self.using = using
+
+    def bulk_create(self, model, objs):
+        return model._default_manager.db_manager(self.using).bulk_create(objs, batch_size=self.batch_size)
+
+
+class CopyLoader(ORMLoader):
+    name = 'copy'
+
+    def bulk_create(self, model, objs):
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        # signals aren't sent: the managers fill the fields set on pre_save
+        manager = model._default_manager
+        if hasattr(manager, 'prepare_bulk_create'):
+            manager.prepare_bulk_create(objs)
+
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            self.reserve_pks(cursor, model, objs)
+            self.copy(cursor, connection, model, objs)
+
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.using
+
+        if model is Word:
+            # as WordManager.bulk_create does
+            self.bulk_create(WordToken, WordToken.objects.tokens_for_words([(word.pk, word.term) for word in objs]))
+        return objs
+
+    def reserve_pks(self, cursor, model, objs):
+        pending = [obj for obj in objs if obj.pk is None]
+        if not pending:
+            return
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, len(pending)],
+        )
+        for obj, (pk,) in zip(pending, cursor.fetchall()):
+            obj.pk = pk
+
+    def copy(self, cursor, connection, model, objs):
+        fields = model._meta.concrete_fields
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write('\t'.join(self.copy_value(field, obj, connection) for field in fields))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in fields),
+        )
+        raw_cursor = cursor.cursor
+        # raise Django exceptions (e.g. IntegrityError) as execute() does
+        with connection.wrap_database_errors:
+            if hasattr(raw_cursor, 'copy_expert'):
+                # psycopg2
+                raw_cursor.copy_expert(sql, buffer)
+            else:
+                # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def copy_value(self, field, obj, connection):
+        value = getattr(obj, field.attname)
+        if isinstance(field, models.JSONField):
+            value = None if value is None else json.dumps(value, cls=field.encoder)
+        else:
+            value = field.get_db_prep_save(value, connection)
+
+        if value is None:
+            return COPY_NULL
+        return str(value).translate(COPY_ESCAPES)
+
+
+LOADERS = {loader.name: loader for loader in (ORMLoader, CopyLoader)}
+
+
+class LoaderCommandMixin:
+    """Option to choose the loader of an import command."""
+
+    def add_loader_argument(self, parser):
+        parser.add_argument(
+            '--loader', choices=sorted(LOADERS), default='orm',
+            help=("How data is inserted: 'orm' (bulk INSERT queries) or 'copy' (PostgreSQL COPY, "
+                  "faster for big files; 'orm' is used on other databases). By default: orm"),
+        )
+
+    def setup_loader(self, options, batch_size=500):
+        self.loader = get_loader(options['loader'], batch_size=batch_size)
+        if self.loader.name != options['loader']:
+            self.stdout.write(self.style.NOTICE(
+                f"INFO\t{options['loader']} loader isn't supported by the database: using {self.loader.name}\n"))
+
+
+def get_loader(name, batch_size=500, using='default'):
+    """
+    Return the loader called name. COPY requires PostgreSQL so the
+    ORM loader is used on other databases.
+    """
+    loader_class = LOADERS[name]
+    if loader_class is CopyLoader and connections[using].vendor != 'postgresql':
+        loader_class = ORMLoader
+    return loader_class(batch_size=batch_size, using=using)
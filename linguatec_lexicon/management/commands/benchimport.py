@@ -0,0 +1,48 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from linguatec_lexicon.loaders import LOADERS
+from linguatec_lexicon.management.commands import importdata
+
+
+class Command(BaseCommand):
+    help = 'Compare the time spent by importdata with each loader (the imported data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lexicon_code', type=str)
+        parser.add_argument('input_file', type=str)
+        parser.add_argument(
+            '--loaders', default=','.join(sorted(LOADERS)),
+            help="Comma separated loaders to be compared. By default: {}".format(','.join(sorted(LOADERS))),
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=importdata.Command.default_batch_size, dest='batch_size',
+            help="Number of rows inserted per query (ORM loader).",
+        )
+
+    def handle(self, *args, **options):
+        loaders = [loader.strip() for loader in options['loaders'].split(',')]
+        for loader in loaders:
+            if loader not in LOADERS:
+                raise CommandError('Error: Unknown loader: ' + loader)
+
+        for loader in loaders:
+            command = importdata.Command(stdout=StringIO(), stderr=StringIO())
+            start = time.perf_counter()
+            with transaction.atomic():
+                call_command(command, options['lexicon_code'], options['input_file'],
+                             loader=loader, batch_size=options['batch_size'])
+                elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+            if command.errors:
+                raise CommandError('Error: The input file has errors (see importdata --dry-run).')
+
+            write_time = sum(elapsed for _, elapsed in command.timings)
+            self.stdout.write("{} loader ({}): total {:.2f}s, writing {:.2f}s ({})".format(
+                loader, command.loader.name, elapsed, write_time,
+                ", ".join("{} {:.2f}s".format(phase, phase_time) for phase, phase_time in command.timings)))
@@ -0,0 +1,65 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from linguatec_lexicon.models import Lexicon
+from linguatec_lexicon.renderers import FastJSONRenderer, orjson
+from linguatec_lexicon.serializers import FlatWordSerializer, WordSerializer
+
+
+class Command(BaseCommand):
+    help = 'Measure the cost per word of the serializers and renderers of words of a lexicon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lexicon_code', type=str)
+        parser.add_argument(
+            '--words', type=int, default=1000,
+            help="Number of words serialized. By default: 1000",
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Times that every case is run (the best time is reported). By default: 5",
+        )
+
+    def handle(self, *args, **options):
+        lexicon_code = options['lexicon_code']
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lexicon_code)
+        except (Lexicon.DoesNotExist, ValueError):
+            raise CommandError('Error: There is not a lexicon with that code: ' + lexicon_code)
+
+        # fetch the words once: only serialization and rendering are measured
+        words = list(WordSerializer.setup_eager_loading(lexicon.words.order_by('term'))[:options['words']])
+        if not words:
+            raise CommandError('Error: The lexicon has no words.')
+
+        request = Request(RequestFactory().get('/'))
+        request.user = AnonymousUser()
+        context = {'request': request, 'format': None}
+
+        cases = [
+            ('WordSerializer + JSONRenderer', WordSerializer, JSONRenderer),
+            ('FlatWordSerializer + JSONRenderer', FlatWordSerializer, JSONRenderer),
+            ('FlatWordSerializer + FastJSONRenderer', FlatWordSerializer, FastJSONRenderer),
+        ]
+        if orjson is None:
+            self.stdout.write("orjson is not installed: FastJSONRenderer uses the standard library.")
+
+        baseline = None
+        for name, serializer_class, renderer_class in cases:
+            best = min(
+                self.measure(words, serializer_class, renderer_class(), context)
+                for _ in range(max(options['repeat'], 1))
+            )
+            per_word = best / len(words) * 1e6
+            baseline = baseline or per_word
+            self.stdout.write("{:<40} {:8.1f} µs/word ({:.1f}x)".format(name, per_word, baseline / per_word))
+
+    def measure(self, words, serializer_class, renderer, context):
+        start = time.perf_counter()
+        renderer.render(serializer_class(words, many=True, context=context).data)
+        return time.perf_counter() - start
@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from linguatec_lexicon import bundle
+from linguatec_lexicon.models import Lexicon
+
+
+class Command(BaseCommand):
+    help = 'Build the offline bundle (SQLite database) of the current data of a lexicon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lexicon_code', type=str)
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Build the bundle even if there is already one of the current data version.",
+        )
+        parser.add_argument(
+            '--keep', type=int, default=1,
+            help="Number of previous bundles of the lexicon which are kept. By default: 1",
+        )
+
+    def handle(self, *args, **options):
+        lexicon_code = options['lexicon_code']
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lexicon_code)
+        except (Lexicon.DoesNotExist, ValueError):
+            raise CommandError('Error: There is not a lexicon with that code: ' + lexicon_code)
+
+        version = bundle.get_current_version(lexicon)
+        path = bundle.get_bundle_path(lexicon, version)
+        if os.path.exists(path) and not options['force']:
+            self.stdout.write("Bundle of version {} already exists: {}".format(version, path))
+        else:
+            start = time.perf_counter()
+            counts = bundle.build_bundle(lexicon, version, path)
+            self.stdout.write("Built bundle of version {} in {:.2f}s: {} ({} bytes)".format(
+                version, time.perf_counter() - start, path, os.path.getsize(path)))
+            self.stdout.write(", ".join("{} {}".format(count, table) for table, count in counts.items()))
+
+        previous = sorted(v for v in bundle.list_bundles(lexicon) if v < version)
+        for old_version in previous[:max(len(previous) - options['keep'], 0)]:
+            os.remove(bundle.get_bundle_path(lexicon, old_version))
+            self.stdout.write("Removed bundle of version {}".format(old_version))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from linguatec_lexicon.cache import response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hits and misses of the API response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Reset the counters after showing them.',
+        )
+
+    def handle(self, *args, **options):
+        if not response_cache.enabled:
+            raise CommandError("Response cache is disabled (see LINGUATEC_LEXICON_RESPONSE_CACHE setting).")
+
+        stats = response_cache.stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write("hits: {hits} misses: {misses} hit ratio: {ratio:.2%}".format(ratio=ratio, **stats))
+
+        if options['reset']:
+            response_cache.reset_stats()
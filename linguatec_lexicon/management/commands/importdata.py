@@ -1,15 +1,24 @@
+import hashlib
 import json
+import os
 import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 
+import openpyxl
 import pandas as pd
+import xlrd
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.db import IntegrityError, transaction
 from django.utils.functional import cached_property
 
 from linguatec_lexicon import utils
+from linguatec_lexicon.loaders import LoaderCommandMixin
 from linguatec_lexicon.models import (Entry, Example, GramaticalCategory,
-                                      Label, Lexicon, VerbalConjugation, Word)
+                                      Label, Lexicon, RenderedWord,
+                                      VerbalConjugation, Word)
 from linguatec_lexicon.validators import validate_column_verb_conjugation
 
 # gramcat auto correction (very common mistakes that could be autocorrected)
@@ -53,6 +62,33 @@ def extract_gramcats(db):
     return gramcats
 
 
+def clean_cell(value):
+    if value is None:
+        return ''  # empty cell
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def xls_cell_value(cell):
+    """Value of a cell read by xlrd as openpyxl returns it."""
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    if cell.ctype == xlrd.XL_CELL_NUMBER and cell.value.is_integer():
+        # xls stores every number as float
+        return int(cell.value)
+    return cell.value
+
+
+def entry_signature(gramcat_ids, labels, phrases, conjugation):
+    """
+    Hash of the content of an entry (but its translation) which is
+    compared to detect if it has been changed.
+    """
+    data = [sorted(set(gramcat_ids)), sorted(labels), list(phrases), conjugation]
+    return hashlib.md5(json.dumps(data).encode()).hexdigest()
+
+
 def is_verb(gramcats):
     for gramcat in gramcats:
         if (gramcat.abbreviation.startswith('v.')
@@ -61,7 +97,8 @@ def is_verb(gramcats):
     return False
 
 
-class Command(BaseCommand):
+class Command(LoaderCommandMixin, BaseCommand):
+    default_batch_size = 500
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -77,6 +114,20 @@ class Command(BaseCommand):
             '--allow-partial', action='store_true', dest='allow_partial',
             help="Allow verbs with partial or unknown format conjugations. USE WITH CAUTION",
         )
+        parser.add_argument(
+            '--batch-size', type=int, default=self.default_batch_size, dest='batch_size',
+            help="Number of rows inserted per query (ORM loader). By default: {}".format(self.default_batch_size),
+        )
+        self.add_loader_argument(parser)
+        parser.add_argument(
+            '--mode', choices=['insert', 'upsert'], default='insert',
+            help=("'insert' requires that the words don't exist yet. 'upsert' compares the file with the "
+                  "lexicon and only writes the changes (new, updated and removed entries). By default: insert"),
+        )
+        parser.add_argument(
+            '--delete-missing', action='store_true', dest='delete_missing',
+            help="On upsert mode, delete the words of the lexicon which aren't on the file.",
+        )
 
     def handle(self, *args, **options):
         self.dry_run = options['dry_run']
@@ -84,6 +135,7 @@ class Command(BaseCommand):
         self.input_file = options['input_file']
         self.allow_partial = options['allow_partial']
         self.lexicon_code = options['lexicon_code']
+        self.setup_writing(options)
 
         # check that GramaticalCategories are initialized
         if not GramaticalCategory.objects.all().exists():
@@ -101,47 +153,80 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.NOTICE(f"INFO\tinput file: {self.input_file}\n"))
 
-        db = self.read_input_file()
-
         # TODO add arg to print (or not gramcats)
         # gramcats = extract_gramcats(db)
 
-        self.populate_models(db)
+        self.populate_models(self.read_input_file())
 
         if self.verbosity >= 2 and self.cleaned_labels:
             self.stdout.write(f"Labels of {self.lexicon.slug}")
             self.stdout.write("; ".join(self.cleaned_labels))
 
         if self.errors:
+            # errors are written as they are detected (see add_error)
             self.stdout.write(self.style.ERROR(f"Detected {len(self.errors)} errors!"))
-            if self.verbosity >= 2:
-                for error in self.errors:
-                    self.stdout.write(self.style.ERROR(json.dumps(error)))
 
         elif not self.dry_run:
             # Write data into the database
-            self.write_to_database()
+            if self.mode == 'upsert':
+                self.upsert_to_database()
+            else:
+                self.write_to_database()
 
-    def read_input_file(self):
-        df = pd.DataFrame()
+    def setup_writing(self, options):
+        self.mode = options['mode']
+        self.delete_missing = options['delete_missing']
+        if self.delete_missing and self.mode != 'upsert':
+            raise CommandError('Error: --delete-missing requires --mode=upsert')
 
-        xlsx = pd.ExcelFile(self.input_file)
+        self.setup_loader(options, batch_size=max(options['batch_size'], 1))
 
-        data = []
-        for sheet in xlsx.sheet_names:
-            # we define na_values and keep_default_na because defaults na_values
-            # includes empty string. We don't want that pandas replaces empty
-            # cells with 'nan'
-            partial = xlsx.parse(sheet, header=None, usecols='A:F')
-            # names=['colA', 'colB', 'colC', 'colD', 'colE', 'colF'])
-            data.append(partial)
+    def read_input_file(self):
+        """
+        Yield the rows of every sheet as tuples of its location (sheet
+        title and row number, starting at 1 as spreadsheets do) and the
+        values of columns A to F (stripped, blank if empty).
+        The workbook is read a sheet (.xls) or a row (.xlsx) at a time
+        so memory usage doesn't depend on the size of the file.
+        """
+        if os.path.splitext(self.input_file)[1].lower() == '.xls':
+            sheets = self.read_xls_sheets()
+        else:
+            sheets = self.read_xlsx_sheets()
 
-        df = pd.concat(data)
-        df_obj = df.select_dtypes(['object'])
-        df[df_obj.columns] = df_obj.apply(lambda x: x.str.strip())
-        df = df.fillna('')  # replace NaN with blank string
+        for title, rows in sheets:
+            for number, row in enumerate(rows, start=1):
+                if all(value is None for value in row):
+                    continue
+                yield ((title, number),) + tuple(clean_cell(value) for value in row)
 
-        return df
+    def read_xlsx_sheets(self):
+        """Yield the title and the rows (values of columns A to F) of every sheet."""
+        workbook = openpyxl.load_workbook(self.input_file, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                # declared dimensions are often wrong (e.g. every row of the sheet)
+                sheet.reset_dimensions()
+                yield sheet.title, sheet.iter_rows(max_col=6, values_only=True)
+        finally:
+            workbook.close()
+
+    def read_xls_sheets(self):
+        """Yield the title and the rows of every sheet of a legacy Excel file (like read_xlsx_sheets)."""
+        workbook = xlrd.open_workbook(self.input_file, on_demand=True)
+        try:
+            for index in range(workbook.nsheets):
+                sheet = workbook.sheet_by_index(index)
+                yield sheet.name, self.read_xls_rows(sheet)
+                workbook.unload_sheet(index)
+        finally:
+            workbook.release_resources()
+
+    def read_xls_rows(self, sheet):
+        for number in range(sheet.nrows):
+            row = [xls_cell_value(cell) for cell in sheet.row_slice(number, end_colx=6)]
+            # rows only include the cells up to the last column of the sheet
+            yield tuple(row) + (None,) * (6 - len(row))
 
     def get_or_create_word(self, term):
         try:
@@ -156,6 +241,7 @@ class Command(BaseCommand):
         created, word = self.get_or_create_word(w_str)
         if created:
             word.slug = utils.calculate_slug(self.lexicon.slug, word.term)
+            word.normalized_term = utils.normalize(word.term)
             self.cleaned_data[word.term] = word
 
         return word
@@ -163,7 +249,7 @@ class Command(BaseCommand):
     def populate_gramcats(self, word, g_str):
         gramcats = []
         if not g_str:
-            self.errors.append({
+            self.add_error({
                 "word": word.term,
                 "column": "B",
                 "message": "missing gramatical category"
@@ -174,7 +260,7 @@ class Command(BaseCommand):
                 try:
                     gramcats.append(self.retrieve_gramcat(abbr))
                 except GramaticalCategory.DoesNotExist:
-                    self.errors.append({
+                    self.add_error({
                         "word": word.term,
                         "column": "B",
                         "message": "unkown gramatical category '{}'".format(abbr)
@@ -217,7 +303,7 @@ class Command(BaseCommand):
 
         ex_strs = [x.strip() for x in ex_str.split('//')]
         if len(word.clean_entries) < len(ex_strs):
-            self.errors.append({
+            self.add_error({
                 "word": word.term,
                 "column": "E",
                 "message": "there are more examples '{}' than entries'{}'".format(
@@ -236,7 +322,7 @@ class Command(BaseCommand):
         # check if word is a verb
         if conjugation_str and not word.is_verb:
             gramcats = [x.abbreviation for x in gramcats]
-            self.errors.append({
+            self.add_error({
                 "word": word.term,
                 "column": "F",
                 "message": "only verbs can have verbal conjugation data (found {})".format(gramcats),
@@ -248,7 +334,7 @@ class Command(BaseCommand):
 
         # check number of conjugations VS number of entries
         if len(word.clean_entries) < len(raw_conjugations):
-            self.errors.append({
+            self.add_error({
                 "word": word.term,
                 "column": "F",
                 "message": "there are more conjugations '{}' than entries'{}'".format(
@@ -263,7 +349,7 @@ class Command(BaseCommand):
                     validate_column_verb_conjugation(raw_conjugation)
                 except ValidationError as e:
                     if not self.allow_partial:
-                        self.errors.append({
+                        self.add_error({
                             "word": word.term,
                             "column": "F",
                             "message": str(e.message),
@@ -276,17 +362,18 @@ class Command(BaseCommand):
                     word.clean_entries[i].clean_conjugation = VerbalConjugation(
                         raw=raw_conjugation)
 
-    def populate_models(self, db):
+    def populate_models(self, rows):
         self.errors = []
         self.cleaned_data = {}
         self.cleaned_entries = []
         self.cleaned_labels = set()
-        for row in db.itertuples(name=None):
-            # itertuples by default return the index as the first element of the tuple.
+        self.location = None
+        for row in rows:
+            # the location is the first element of the tuple (see read_input_file)
+            self.location = row[0]
 
-            # filter empty rows
-            # TODO how to ignore empty rows in an elegant way?
-            if pd.isnull(row) or pd.isna(row[1]) or pd.isnull(row[1]) or row[1] == '':
+            # filter rows without word
+            if len(row) < 2 or row[1] == '':
                 continue
 
             # column A is word (required)
@@ -319,6 +406,18 @@ class Command(BaseCommand):
                 continue
             self.populate_verbal_conjugation(word, gramcats, conjugation_str)
 
+    def add_error(self, error):
+        """
+        Store an error of the row being validated and write it (if
+        verbosity >= 2) without waiting for the whole file to be read.
+        """
+        if self.location is not None:
+            sheet, number = self.location
+            error = dict(sheet=sheet, row=number, **error)
+        self.errors.append(error)
+        if self.verbosity >= 2:
+            self.stdout.write(self.style.ERROR(json.dumps(error)))
+
     def populate_label(self, word, label_str):
         # support multiple label (separated by "//")
         row_labels = []
@@ -343,65 +442,303 @@ class Command(BaseCommand):
             for i, entry in enumerate(word.clean_entries):
                 entry.label = row_labels[i]
 
+    @contextmanager
+    def timed(self, phase):
+        """Measure the time spent on a phase of the import."""
+        start = time.perf_counter()
+        yield
+        self.timings.append((phase, time.perf_counter() - start))
+
     @transaction.atomic
     def write_to_database(self):
-        count_words = 0
-        count_entries = 0
-        count_examples = 0
+        self.timings = []
 
-        try:
-            Word.objects.bulk_create(self.cleaned_data.values(), batch_size=100)
-        except IntegrityError as e:
-            self.stdout.write(self.style.ERROR(
-                "Error: Already exists term '{}' on lexicon '{}'".format(e, self.lexicon_code)
+        with self.timed('words'):
+            try:
+                self.loader.bulk_create(Word, self.cleaned_data.values())
+            except IntegrityError as e:
+                self.stdout.write(self.style.ERROR(
+                    "Error: Already exists term '{}' on lexicon '{}'".format(e, self.lexicon_code)
+                ))
+                sys.exit(1)
+
+            # retrieve words to get its PK
+            words = {w[0]: w[1] for w in Word.objects.filter(lexicon=self.lexicon).values_list('term', 'id')}
+            count_words = len(self.cleaned_data)
+
+        with self.timed('entries'):
+            for entry in self.cleaned_entries:
+                word_pk = words[entry.word_term]
+                entry.word_id = word_pk
+            self.loader.bulk_create(Entry, self.cleaned_entries)
+            count_entries = len(self.cleaned_entries)
+
+        with self.timed('gramcats'):
+            self.write_entries_gramcats(self.cleaned_entries)
+
+        with self.timed('examples'):
+            count_examples = self.write_examples(self.cleaned_entries)
+
+        with self.timed('conjugations'):
+            self.write_conjugations(self.cleaned_entries, words)
+            linked_word_ids = self.link_conjugations_to_model_words(words)
+
+        with self.timed('labels'):
+            self.write_labels(self.cleaned_entries)
+
+        with self.timed('validation'):
+            self.validate_unique_together()
+
+        with self.timed('rendering'):
+            word_ids = {words[term] for term in self.cleaned_data}.union(linked_word_ids)
+            RenderedWord.objects.rebuild(Word.objects.filter(pk__in=word_ids))
+
+        self.stdout.write("Imported: %s words, %s entries, %s examples" %
+                          (count_words, count_entries, count_examples))
+        self.stdout.write("Timings: " + ", ".join(
+            "{} {:.2f}s".format(phase, elapsed) for phase, elapsed in self.timings))
+
+    @transaction.atomic
+    def upsert_to_database(self):
+        """
+        Compare the file with the data of the lexicon and write only the
+        changes: new words and entries are inserted, entries whose
+        gramcats, label, examples or conjugation differ are updated and
+        entries of the words of the file which aren't on it are deleted.
+        Entries are identified by their word and translation so marked
+        translations of unchanged entries are kept.
+        """
+        self.timings = []
+        self.counts = Counter()
+
+        with self.timed('words'):
+            words = self.upsert_words()
+
+        with self.timed('entries'):
+            written, changed_word_ids = self.upsert_entries(words)
+
+        with self.timed('gramcats'):
+            self.write_entries_gramcats(written)
+
+        with self.timed('examples'):
+            self.counts['examples inserted'] = self.write_examples(written)
+
+        with self.timed('conjugations'):
+            self.counts['conjugations inserted'] = self.write_conjugations(written, words)
+            linked_word_ids = self.link_conjugations_to_model_words(words)
+
+        with self.timed('labels'):
+            self.write_labels(written)
+
+        with self.timed('validation'):
+            self.validate_unique_together()
+
+        with self.timed('rendering'):
+            word_ids = changed_word_ids.union(linked_word_ids)
+            if word_ids:
+                RenderedWord.objects.rebuild(Word.objects.filter(pk__in=word_ids))
+            elif self.counts['words deleted']:
+                Lexicon.objects.bump_data_version([self.lexicon.pk])
+
+        counts = self.counts
+        self.stdout.write(
+            "Upserted: words {} inserted, {} updated, {} unchanged, {} deleted; "
+            "entries {} inserted, {} updated, {} unchanged, {} deleted; "
+            "examples {} inserted, {} deleted; conjugations {} inserted, {} deleted".format(
+                counts['words inserted'], counts['words updated'], counts['words unchanged'],
+                counts['words deleted'], counts['entries inserted'], counts['entries updated'],
+                counts['entries unchanged'], counts['entries deleted'], counts['examples inserted'],
+                counts[Example._meta.label], counts['conjugations inserted'], counts[VerbalConjugation._meta.label],
             ))
-            sys.exit(1)
+        self.stdout.write("Timings: " + ", ".join(
+            "{} {:.2f}s".format(phase, elapsed) for phase, elapsed in self.timings))
+
+    def upsert_words(self):
+        """
+        Insert the words of the file which don't exist (and delete the
+        ones which aren't on the file if requested).
+        Returns a dict {term: id} of the words of the lexicon.
+        """
+        words = dict(Word.objects.filter(lexicon=self.lexicon).values_list('term', 'id'))
+
+        if self.delete_missing:
+            missing = [pk for term, pk in words.items() if term not in self.cleaned_data]
+            self.counts.update(Word.objects.filter(pk__in=missing).delete()[1])
+            self.counts['words deleted'] = len(missing)
+            words = {term: pk for term, pk in words.items() if term in self.cleaned_data}
 
-        # retrieve words to get its PK
-        words = {w[0]: w[1] for w in Word.objects.filter(lexicon=self.lexicon).values_list('term', 'id')}
-        count_words = len(self.cleaned_data)
+        new_words = [word for term, word in self.cleaned_data.items() if term not in words]
+        self.loader.bulk_create(Word, new_words)
+        words.update((word.term, word.pk) for word in new_words)
+        self.counts['words inserted'] = len(new_words)
 
         for entry in self.cleaned_entries:
-            word_pk = words[entry.word_term]
-            entry.word_id = word_pk
-        Entry.objects.bulk_create(self.cleaned_entries, batch_size=100)
+            entry.word_id = words[entry.word_term]
+        return words
 
+    def upsert_entries(self, words):
+        """
+        Insert new entries, clear the relations of changed entries and
+        delete entries removed from the file.
+        Returns the entries whose relations have to be written and the
+        ids of the words which have been changed.
+        """
+        file_word_ids = {words[term] for term in self.cleaned_data}
+        stored = self.read_stored_entries(file_word_ids)
+
+        # a word may have the same translation with several gramcats: pair
+        # first the entries with the same gramcats and then the remaining
+        # ones in order (their gramcats have been changed)
+        unmatched, matched = [], []
         for entry in self.cleaned_entries:
-            entry.gramcats.set(entry.clean_gramcats)
-            count_entries += 1
+            candidates = stored.get((entry.word_id, entry.translation), [])
+            gramcat_ids = frozenset(gramcat.pk for gramcat in entry.clean_gramcats)
+            match = next((stored_entry for stored_entry in candidates if stored_entry[1] == gramcat_ids), None)
+            if match is None:
+                unmatched.append(entry)
+            else:
+                candidates.remove(match)
+                matched.append((entry, match))
+
+        new_entries = []
+        for entry in unmatched:
+            candidates = stored.get((entry.word_id, entry.translation))
+            if candidates:
+                matched.append((entry, candidates.pop(0)))
+            else:
+                new_entries.append(entry)
+
+        changed_entries = []
+        for entry, (pk, _, signature) in matched:
+            entry.pk = pk
+            if signature != self.get_entry_signature(entry):
+                changed_entries.append(entry)
+
+        # the remaining entries have been removed from the file
+        removed = {pk: word_id for (word_id, _), candidates in stored.items() for pk, _, _ in candidates}
+        self.counts.update(Entry.objects.filter(pk__in=list(removed)).delete()[1])
+
+        changed_pks = [entry.pk for entry in changed_entries]
+        for model in (Entry.gramcats.through, Label.entries.through, Example, VerbalConjugation):
+            self.counts.update(model.objects.filter(entry_id__in=changed_pks).delete()[1])
+
+        self.loader.bulk_create(Entry, new_entries)
+
+        changed_word_ids = {entry.word_id for entry in new_entries + changed_entries}
+        changed_word_ids.update(removed.values())
+        self.counts['entries inserted'] = len(new_entries)
+        self.counts['entries updated'] = len(changed_entries)
+        self.counts['entries deleted'] = len(removed)
+        self.counts['entries unchanged'] = len(self.cleaned_entries) - len(new_entries) - len(changed_entries)
+        self.counts['words updated'] = len(changed_word_ids) - self.counts['words inserted']
+        self.counts['words unchanged'] = len(file_word_ids) - len(changed_word_ids)
+        return new_entries + changed_entries, changed_word_ids
+
+    def read_stored_entries(self, word_ids):
+        """
+        Return the entries (without diatopic variation) of the words as
+        a dict {(word_id, translation): [(id, gramcat ids, signature)]}.
+        Relations are read with a query per table instead of a query per
+        entry.
+        """
+        entries = Entry.objects.filter(word__lexicon=self.lexicon, variation__isnull=True)
+
+        gramcats, labels, phrases = defaultdict(list), defaultdict(list), defaultdict(list)
+        EntryGramcats, LabelEntries = Entry.gramcats.through, Label.entries.through
+        for entry_id, gramcat_id in EntryGramcats.objects.filter(
+                entry__in=entries).values_list('entry_id', 'gramaticalcategory_id'):
+            gramcats[entry_id].append(gramcat_id)
+        for entry_id, label in LabelEntries.objects.filter(entry__in=entries).values_list('entry_id', 'label__name'):
+            labels[entry_id].append(label)
+        for entry_id, phrase in Example.objects.filter(entry__in=entries).order_by('pk').values_list(
+                'entry_id', 'phrase'):
+            phrases[entry_id].append(phrase)
+        conjugations = dict(VerbalConjugation.objects.filter(entry__in=entries).values_list('entry_id', 'raw'))
+
+        stored = defaultdict(list)
+        for pk, word_id, translation in entries.order_by('pk').values_list('pk', 'word_id', 'translation'):
+            if word_id in word_ids:
+                signature = entry_signature(gramcats[pk], labels[pk], phrases[pk], conjugations.get(pk))
+                stored[(word_id, translation)].append((pk, frozenset(gramcats[pk]), signature))
+        return stored
+
+    def get_entry_signature(self, entry):
+        conjugation = getattr(entry, 'clean_conjugation', None)
+        return entry_signature(
+            [gramcat.pk for gramcat in entry.clean_gramcats],
+            [entry.label] if getattr(entry, 'label', None) else [],
+            [example.phrase for example in entry.clean_examples],
+            conjugation.raw if conjugation else None,
+        )
 
+    def write_entries_gramcats(self, entries):
+        # insert rows of the relation table instead of a query per entry
+        self.loader.bulk_create(Entry.gramcats.through, Entry.objects.gramcats_for_entries(
+            (entry.pk, entry.clean_gramcats) for entry in entries))
+
+    def write_examples(self, entries):
+        examples = []
+        for entry in entries:
             for example in entry.clean_examples:
                 example.entry_id = entry.pk
-                example.save()
-                count_examples += 1
+                examples.append(example)
+        self.loader.bulk_create(Example, examples)
+        return len(examples)
 
+    def write_conjugations(self, entries, words):
+        conjugations = []
+        for entry in entries:
             try:
-                entry.clean_conjugation.entry_id = entry.pk
-                entry.clean_conjugation.save()
+                conjugation = entry.clean_conjugation
             except AttributeError:
-                pass
-
+                continue
+            conjugation.entry_id = entry.pk
+            # bulk inserts don't call save() which parses it
+            conjugation.parse(lexicon_words=words)
+            conjugations.append(conjugation)
+        self.loader.bulk_create(VerbalConjugation, conjugations)
+        return len(conjugations)
+
+    def write_labels(self, entries):
         # store labels & create relations with entries
         # NOTE only create not existing labels. For example ar-es
         # content is splited on several XLSX files so labels may
         # already exist.
         existing_labels = self.lexicon.labels.values_list("name", flat=True)
         new_labels = self.cleaned_labels - set(existing_labels)
-        Label.objects.bulk_create([
+        self.loader.bulk_create(Label, [
             Label(name=label, lexicon=self.lexicon) for label in new_labels
-        ], batch_size=200)
+        ])
 
         # cache labels to optimize get query
-        all_labels = {label.name: label for label in self.lexicon.labels.all()}
-        for entry in self.cleaned_entries:
-            if getattr(entry, "label", None):
-                label_model = all_labels[entry.label]
-                label_model.entries.add(entry)
-
-        self.validate_unique_together()
-
-        self.stdout.write("Imported: %s words, %s entries, %s examples" %
-                          (count_words, count_entries, count_examples))
+        all_labels = {label.name: label.pk for label in self.lexicon.labels.all()}
+        LabelEntries = Label.entries.through
+        self.loader.bulk_create(LabelEntries, [
+            LabelEntries(label_id=all_labels[entry.label], entry_id=entry.pk)
+            for entry in entries
+            if getattr(entry, "label", None)
+        ])
+
+    def link_conjugations_to_model_words(self, words):
+        """
+        Link conjugations to model words which were missing when they
+        were imported (e.g. ar-es content is splited on several files).
+        Returns the ids of the words of the updated conjugations.
+        """
+        qs = VerbalConjugation.objects.filter(
+            entry__word__lexicon=self.lexicon,
+            parsed__has_key='model_word',
+            model_word_ref__isnull=True,
+        ).select_related('entry')
+        conjugations = []
+        for conjugation in qs:
+            conjugation.model_word_ref_id = words.get(conjugation.model_word)
+            if conjugation.model_word_ref_id is not None:
+                conjugations.append(conjugation)
+
+        VerbalConjugation.objects.bulk_update(conjugations, ['model_word_ref'], batch_size=100)
+
+        return {conjugation.entry.word_id for conjugation in conjugations}
 
     def validate_unique_together(self):
         """
@@ -1,7 +1,8 @@
 import pandas as pd
 from django.core.management.base import BaseCommand, CommandError
 
-from linguatec_lexicon.models import GramaticalCategory
+from linguatec_lexicon.models import (GramaticalCategory, Lexicon,
+                                      RenderedWord, Word)
 
 
 class Command(BaseCommand):
@@ -25,7 +26,12 @@ class Command(BaseCommand):
         self.verbosity = options['verbosity']
         self.purge_gramcat = options['purge']
 
+        # words whose rendered content includes the purged gramcats
+        # (imported gramcats are new so they aren't included on any word)
+        word_ids = []
         if self.purge_gramcat:
+            words = Word.objects.filter(entries__gramcats__isnull=False)
+            word_ids = list(words.values_list('pk', flat=True).distinct())
             deleted, _ = GramaticalCategory.objects.all().delete()
             if self.verbosity >= 1:
                 self.stdout.write(
@@ -33,6 +39,10 @@ class Command(BaseCommand):
                 )
 
         self.loaddata(csv_files)
+        if word_ids:
+            RenderedWord.objects.rebuild(Word.objects.filter(pk__in=word_ids))
+        # gramatical categories are included on the words of every lexicon
+        Lexicon.objects.bump_data_version()
 
         if self.verbosity >= 1:
             self.stdout.write(
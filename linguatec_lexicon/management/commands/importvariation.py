@@ -6,11 +6,13 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils.functional import cached_property
 
+from linguatec_lexicon.loaders import LoaderCommandMixin
 from linguatec_lexicon.models import (DiatopicVariation, Entry,
-                                      GramaticalCategory, Lexicon, Word)
+                                      GramaticalCategory, Lexicon,
+                                      RenderedWord, Word)
 
 
-class Command(BaseCommand):
+class Command(LoaderCommandMixin, BaseCommand):
     help = 'Imports diatopic variation Excel into the database'
 
     def add_arguments(self, parser):
@@ -27,6 +29,7 @@ class Command(BaseCommand):
             '--dry-run', action='store_true', dest='dry_run',
             help="Just validate input file; don't actually import to database.",
         )
+        self.add_loader_argument(parser)
 
     def clean_variation(self, value):
         if self.dry_run:
@@ -44,6 +47,7 @@ class Command(BaseCommand):
         self.dry_run = options['dry_run']
         self.verbosity = options['verbosity']
         self.lexicon_code = options['lexicon_code']
+        self.setup_loader(options)
 
         # validate input_file
         _, file_extension = os.path.splitext(self.input_file)
@@ -222,10 +226,13 @@ class Command(BaseCommand):
 
     @transaction.atomic
     def write_to_database(self):
-        Entry.objects.bulk_create(self.entries, batch_size=100)
+        self.loader.bulk_create(Entry, self.entries)
 
-        for entry in self.entries:
-            entry.gramcats.set(entry.clean_gramcats)
+        # insert rows of the relation table instead of a query per entry
+        self.loader.bulk_create(Entry.gramcats.through, Entry.objects.gramcats_for_entries(
+            (entry.pk, entry.clean_gramcats) for entry in self.entries))
+
+        RenderedWord.objects.rebuild(Word.objects.filter(pk__in={entry.word_id for entry in self.entries}))
 
         count_entries = len(self.entries)
         self.stdout.write("Imported: {} entries of {} words.".format(
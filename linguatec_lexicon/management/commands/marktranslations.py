@@ -5,7 +5,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.functional import cached_property
 
-from linguatec_lexicon.models import Entry, Lexicon
+from linguatec_lexicon.models import Entry, Lexicon, RenderedWord, Word
 from linguatec_lexicon.validators import validate_balanced_parenthesis
 
 
@@ -55,6 +55,8 @@ class Command(BaseCommand):
                 entries.append(entry)
 
         Entry.objects.bulk_update(entries, ['marked_translation'], batch_size=self.batch_size)
+        RenderedWord.objects.rebuild(
+            Word.objects.filter(pk__in={entry.word_id for entry in entries}), batch_size=self.batch_size)
 
         return len(entries), qs.count()
 
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from linguatec_lexicon import utils
+from linguatec_lexicon.models import Entry, Example, Lexicon, Word, WordToken
+
+
+class Command(BaseCommand):
+    help = 'Update normalized terms, tokens, translations and examples of the words (backfill of existing rows)'
+    default_batch_size = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many words are updated in a single query "
+                  "Directly passed to bulk_update. By default: {}").format(self.default_batch_size),
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size'] or self.default_batch_size
+
+        for lexicon in Lexicon.objects.all():
+            updated = self.normalize_terms(lexicon)
+            entries = self.normalize_translations(lexicon)
+            examples = self.normalize_examples(lexicon)
+            self.stdout.write("Lexicon {} normalized {} words, {} entries and {} examples".format(
+                lexicon.slug, updated, entries, examples))
+
+    @transaction.atomic
+    def normalize_terms(self, lexicon):
+        words = list(lexicon.words.only('id', 'term', 'normalized_term'))
+        for word in words:
+            word.normalized_term = utils.normalize(word.term)
+
+        Word.objects.bulk_update(words, ['normalized_term'], batch_size=self.batch_size)
+
+        WordToken.objects.filter(word__lexicon=lexicon).delete()
+        WordToken.objects.create_for_words(
+            [(word.pk, word.term) for word in words], batch_size=self.batch_size)
+
+        return len(words)
+
+    @transaction.atomic
+    def normalize_translations(self, lexicon):
+        entries = list(Entry.objects.filter(word__lexicon=lexicon).only('id', 'translation', 'marked_translation'))
+        for entry in entries:
+            entry.normalized_translation = entry.normalize_translation()
+
+        Entry.objects.bulk_update(entries, ['normalized_translation'], batch_size=self.batch_size)
+        return len(entries)
+
+    @transaction.atomic
+    def normalize_examples(self, lexicon):
+        examples = list(Example.objects.filter(entry__word__lexicon=lexicon).only('id', 'phrase'))
+        for example in examples:
+            example.normalized_phrase = utils.normalize(example.phrase)
+
+        Example.objects.bulk_update(examples, ['normalized_phrase'], batch_size=self.batch_size)
+        return len(examples)
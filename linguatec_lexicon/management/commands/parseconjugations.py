@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from linguatec_lexicon.models import Lexicon, VerbalConjugation
+
+
+class Command(BaseCommand):
+    help = 'Parse raw verbal conjugations and store the result (backfill of existing rows)'
+    default_batch_size = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many conjugations are updated in a single query "
+                  "Directly passed to bulk_update. By default: {}").format(self.default_batch_size),
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size'] or self.default_batch_size
+
+        for lexicon in Lexicon.objects.all():
+            parsed, unlinked = self.parse_conjugations(lexicon)
+            self.stdout.write("Lexicon {} parsed {} conjugations ({} without model word)".format(
+                lexicon.slug, parsed, unlinked))
+
+    @transaction.atomic
+    def parse_conjugations(self, lexicon):
+        # cache lexicon words on a dict (hash lookup has better performance)
+        words = {word[0]: word[1] for word in lexicon.words.values_list('term', 'id')}
+
+        conjugations = list(VerbalConjugation.objects.filter(entry__word__lexicon=lexicon))
+        unlinked = 0
+        for conjugation in conjugations:
+            conjugation.parse(lexicon_words=words)
+            if conjugation.model_word is not None and conjugation.model_word_ref_id is None:
+                unlinked += 1
+
+        VerbalConjugation.objects.bulk_update(
+            conjugations, ['parsed', 'model_word_ref'], batch_size=self.batch_size)
+
+        return len(conjugations), unlinked
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from linguatec_lexicon.models import Lexicon, RenderedWord
+
+
+class Command(BaseCommand):
+    help = 'Render words and store the result to serve them without querying related models'
+    default_batch_size = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'lexicon_code', type=str, nargs='?',
+            help="Select the lexicon to be rendered. By default: all of them",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many words are rendered and created in a single query. "
+                  "By default: {}").format(self.default_batch_size),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or self.default_batch_size
+        lexicon_code = options['lexicon_code']
+
+        if lexicon_code is None:
+            lexicons = Lexicon.objects.all()
+        else:
+            try:
+                lexicons = [Lexicon.objects.get_by_slug(lexicon_code)]
+            except Lexicon.DoesNotExist:
+                raise CommandError('Error: There is not a lexicon with that code: ' + lexicon_code)
+
+        for lexicon in lexicons:
+            count = RenderedWord.objects.rebuild(lexicon.words.all(), batch_size=batch_size)
+            self.stdout.write("Lexicon {} rendered {} words".format(lexicon.slug, count))
@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+
+from linguatec_lexicon.cache import response_cache
+from linguatec_lexicon.models import Lexicon, RenderedWord
+from linguatec_lexicon.views import WordViewSet
+
+
+class Command(BaseCommand):
+    help = 'Render words and fill the API response cache with the most common queries of a lexicon'
+    default_workers = 4
+    endpoints = ('search', 'near', 'exact', 'lookup')
+
+    def add_arguments(self, parser):
+        parser.add_argument('lexicon_code', type=str)
+        parser.add_argument(
+            '--terms-file',
+            help=("File with a query per line sorted by frequency (e.g. a query log) "
+                  "optionally followed by a tab and its count. By default: every word of the lexicon"),
+        )
+        parser.add_argument(
+            '--top', type=int,
+            help="Only request the N most common queries.",
+        )
+        parser.add_argument(
+            '--endpoints', default='search,exact',
+            help="Comma separated endpoints to be requested ({}). By default: search,exact".format(
+                ', '.join(self.endpoints)),
+        )
+        parser.add_argument(
+            '--base-url', default='http://localhost/',
+            help=("URL of the API as requested by clients (links of the responses "
+                  "depend on it). By default: http://localhost/"),
+        )
+        parser.add_argument(
+            '--workers', type=int, default=self.default_workers,
+            help="Number of threads requesting the queries. By default: {}".format(self.default_workers),
+        )
+        parser.add_argument(
+            '--allow-local-cache', action='store_true', dest='allow_local_cache',
+            help="Run even if the cache backend is local to this process (e.g. LocMemCache) and so "
+                 "the responses aren't available to the server processes.",
+        )
+
+    def handle(self, *args, **options):
+        lexicon_code = options['lexicon_code']
+        try:
+            self.lexicon = Lexicon.objects.get_by_slug(lexicon_code)
+        except Lexicon.DoesNotExist:
+            raise CommandError('Error: There is not a lexicon with that code: ' + lexicon_code)
+
+        if not response_cache.enabled:
+            raise CommandError("Response cache is disabled (see LINGUATEC_LEXICON_RESPONSE_CACHE setting).")
+        if response_cache.is_process_local and not options['allow_local_cache']:
+            raise CommandError(
+                "Response cache backend ({}) is local to this process so the server won't use the cached "
+                "responses. Configure a shared cache (e.g. memcached) on LINGUATEC_LEXICON_RESPONSE_CACHE "
+                "or use --allow-local-cache.".format(type(response_cache.cache).__name__))
+
+        endpoints = [endpoint.strip() for endpoint in options['endpoints'].split(',')]
+        for endpoint in endpoints:
+            if endpoint not in self.endpoints:
+                raise CommandError('Error: Unknown endpoint: ' + endpoint)
+
+        base_url = urlsplit(options['base_url'])
+        self.factory = RequestFactory(**{
+            'HTTP_HOST': base_url.netloc,
+            'HTTP_ACCEPT': 'application/json',
+            'wsgi.url_scheme': base_url.scheme,
+        })
+
+        start = time.perf_counter()
+
+        # render words before caching the responses (it updates data version)
+        rendered = RenderedWord.objects.rebuild(self.lexicon.words.filter(rendered__isnull=True))
+        self.stdout.write("Rendered {} words in {:.2f}s".format(rendered, time.perf_counter() - start))
+
+        terms = self.read_terms(options['terms_file'], options['top'])
+        requests = [(endpoint, term) for term in terms for endpoint in endpoints]
+
+        warm_start = time.perf_counter()
+        workers = max(options['workers'], 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self.warm, [requests[i::workers] for i in range(workers)])
+            stats = {'MISS': 0, 'HIT': 0, 'errors': 0}
+            for result in results:
+                for key, value in result.items():
+                    stats[key] += value
+
+        elapsed = time.perf_counter() - warm_start
+        self.stdout.write(
+            "Requested {} queries in {:.2f}s ({:.1f} queries/s): {} cached, {} already cached, {} errors".format(
+                len(requests), elapsed, len(requests) / elapsed if elapsed else 0,
+                stats['MISS'], stats['HIT'], stats['errors']))
+        self.stdout.write("Total time: {:.2f}s".format(time.perf_counter() - start))
+
+    def read_terms(self, terms_file, top):
+        if terms_file is None:
+            terms = self.lexicon.words.order_by('term').values_list('term', flat=True)
+            return list(terms[:top] if top else terms)
+
+        terms = []
+        with open(terms_file, encoding='utf-8') as f:
+            for line in f:
+                term = line.split('\t')[0].strip()
+                if term:
+                    terms.append(term)
+                if top and len(terms) >= top:
+                    break
+        return terms
+
+    def warm(self, requests):
+        """Request the queries (on its own thread) and count the results."""
+        stats = {'MISS': 0, 'HIT': 0, 'errors': 0}
+        try:
+            for endpoint, term in requests:
+                view = WordViewSet.as_view({'get': endpoint})
+                request = self.factory.get('/words/{}/'.format(endpoint), {'q': term, 'l': self.lexicon.slug})
+                response = view(request)
+                if response.status_code == 200:
+                    stats[response.headers.get('X-Cache', 'HIT')] += 1
+                else:
+                    stats['errors'] += 1
+        finally:
+            # every thread opens its own database connection
+            connections.close_all()
+        return stats
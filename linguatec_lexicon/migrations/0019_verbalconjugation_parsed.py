@@ -0,0 +1,24 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0018_word_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verbalconjugation',
+            name='model_word_ref',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='linguatec_lexicon.word'),
+        ),
+        migrations.AddField(
+            model_name='verbalconjugation',
+            name='parsed',
+            field=models.JSONField(editable=False, null=True),
+        ),
+    ]
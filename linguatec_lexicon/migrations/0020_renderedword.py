@@ -0,0 +1,22 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0019_verbalconjugation_parsed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedWord',
+            fields=[
+                ('slug', models.SlugField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('word', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rendered', to='linguatec_lexicon.word')),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:16
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGinExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0020_renderedword'),
+    ]
+
+    operations = [
+        # allow including lexicon_id on the GIN index
+        BtreeGinExtension(),
+        migrations.AddIndex(
+            model_name='word',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['lexicon', 'term'], name='word-lexicon-term-trgm', opclasses=['int4_ops', 'gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from linguatec_lexicon.utils import tokenize
+
+
+def generate_tokens(apps, schema_editor):
+    Word = apps.get_model('linguatec_lexicon', 'Word')
+    WordToken = apps.get_model('linguatec_lexicon', 'WordToken')
+
+    WordToken.objects.bulk_create([
+        WordToken(word_id=word_id, token=token)
+        for word_id, term in Word.objects.values_list('id', 'term').iterator()
+        for token in tokenize(term)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0021_word_term_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=64)),
+                ('word', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='linguatec_lexicon.word')),
+            ],
+        ),
+        migrations.RunPython(generate_tokens, migrations.RunPython.noop),
+    ]
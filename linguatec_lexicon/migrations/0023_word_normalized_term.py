@@ -0,0 +1,55 @@
+# Generated by Django 4.2.14 on 2026-10-18 09:12
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations, models
+
+from linguatec_lexicon.utils import normalize, tokenize
+
+
+def normalize_terms(apps, schema_editor):
+    Word = apps.get_model('linguatec_lexicon', 'Word')
+    WordToken = apps.get_model('linguatec_lexicon', 'WordToken')
+
+    words = []
+    for word in Word.objects.only('id', 'term').iterator():
+        word.normalized_term = normalize(word.term)
+        words.append(word)
+    Word.objects.bulk_update(words, ['normalized_term'], batch_size=1000)
+
+    # tokens are normalized too
+    WordToken.objects.all().delete()
+    WordToken.objects.bulk_create([
+        WordToken(word_id=word.id, token=token)
+        for word in words
+        for token in tokenize(word.term)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0022_wordtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='normalized_term',
+            field=models.CharField(default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(normalize_terms, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='word',
+            name='word-lexicon-term-trgm',
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['lexicon', 'normalized_term'], name='word-lexicon-normalized-term'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=GinIndex(fields=['lexicon', 'normalized_term'], name='word-lexicon-normalized-trgm',
+                           opclasses=['int4_ops', 'gin_trgm_ops']),
+        ),
+    ]
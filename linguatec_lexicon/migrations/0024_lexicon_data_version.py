@@ -0,0 +1,24 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:42
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0023_word_normalized_term'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lexicon',
+            name='data_modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lexicon',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
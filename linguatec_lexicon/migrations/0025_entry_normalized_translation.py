@@ -0,0 +1,37 @@
+# Generated by Django 4.2.14 on 2026-10-17 23:58
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+from linguatec_lexicon.utils import normalize
+
+
+def normalize_translations(apps, schema_editor):
+    Entry = apps.get_model('linguatec_lexicon', 'Entry')
+
+    entries = []
+    for entry in Entry.objects.only('id', 'translation', 'marked_translation').iterator():
+        entry.normalized_translation = normalize(strip_tags(entry.marked_translation or entry.translation))
+        entries.append(entry)
+    Entry.objects.bulk_update(entries, ['normalized_translation'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0024_lexicon_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='normalized_translation',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(normalize_translations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='entry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['normalized_translation'], name='entry-translation-trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.14 on 2026-10-18 00:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from linguatec_lexicon.utils import normalize
+
+
+def normalize_phrases(apps, schema_editor):
+    Example = apps.get_model('linguatec_lexicon', 'Example')
+
+    examples = []
+    for example in Example.objects.only('id', 'phrase').iterator():
+        example.normalized_phrase = normalize(example.phrase)
+        examples.append(example)
+    Example.objects.bulk_update(examples, ['normalized_phrase'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0025_entry_normalized_translation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='example',
+            name='normalized_phrase',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(normalize_phrases, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='example',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['normalized_phrase'], name='example-phrase-trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,16 +1,44 @@
+import collections
+import re
+import threading
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.lookups import TrigramSimilar
 from django.contrib.postgres.search import TrigramSimilarity
-from django.core.exceptions import ValidationError
-from django.db import connection, models
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Max, Q, Sum
 from django.db.models import Value as V
-from django.db.models.functions import MD5, Concat
+from django.db.models.functions import MD5, Cast, Concat
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.functional import cached_property
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 
 from linguatec_lexicon import utils, validators
 
 
+# Threshold of the trigram `%` operator: the lowest similarity used by
+# word searches, which compare the similarity with their own minimum.
+TRIGRAM_SIMILARITY_THRESHOLD = 0.2
+
+
+@receiver(connection_created)
+def set_trigram_similarity_threshold(sender, connection, **kwargs):
+    # set once per connection, so building a queryset has no side effects
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, false)",
+                           [str(TRIGRAM_SIMILARITY_THRESHOLD)])
+
+
 def annotate_words_slug(lexicon):
     lex_slug = lexicon.slug
     qs = lexicon.words.all()
@@ -21,8 +49,95 @@ def annotate_words_slug(lexicon):
     )
 
 
+class LexiconCache:
+    """
+    Process-local LRU cache of lexicons retrieved by slug or by id.
+
+    Lexicons almost never change so they are kept in memory of each
+    process until a lexicon is saved or deleted. Changes made by other
+    processes are detected using a version stored on the Django cache
+    configured on LINGUATEC_LEXICON_LEXICON_CACHE setting, which must be
+    shared by the processes (e.g. memcached). Lexicons are retrieved
+    from the database on every call if it isn't configured.
+
+    NOTE: cached instances are shared, don't modify them.
+    """
+    VERSION_KEY = 'linguatec_lexicon:lexicons-version'
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.version = None
+        self.lexicons = collections.OrderedDict()
+
+    @property
+    def version_cache(self):
+        alias = getattr(settings, 'LINGUATEC_LEXICON_LEXICON_CACHE', None)
+        return caches[alias] if alias is not None else None
+
+    def _check_version(self, version_cache):
+        version = version_cache.get(self.VERSION_KEY)
+        if version is None:
+            version_cache.add(self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = version_cache.get(self.VERSION_KEY)
+
+        if version != self.version:
+            self.lexicons.clear()
+            self.version = version
+
+    def get(self, key, retrieve):
+        """Retrieve the lexicon of the key, calling retrieve() on cache miss."""
+        version_cache = self.version_cache
+        if version_cache is None:
+            # changes made by other processes couldn't be detected
+            return retrieve()
+
+        with self.lock:
+            self._check_version(version_cache)
+            version = self.version
+            try:
+                self.lexicons.move_to_end(key)
+                return self.lexicons[key]
+            except KeyError:
+                pass
+
+        lexicon = retrieve()
+
+        with self.lock:
+            if version != self.version:
+                # invalidated meanwhile: don't cache a stale lexicon
+                return lexicon
+
+            # lexicon retrieved by slug is available by id too
+            for key in {key, ('id', lexicon.pk)}:
+                self.lexicons[key] = lexicon
+            while len(self.lexicons) > self.maxsize:
+                self.lexicons.popitem(last=False)
+        return lexicon
+
+    def invalidate(self):
+        version_cache = self.version_cache
+        with self.lock:
+            if version_cache is not None:
+                version_cache.set(self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            self.lexicons.clear()
+            self.version = None
+
+
 class LexiconManager(models.Manager):
+    cache = LexiconCache()
+
     def get_by_slug(self, slug):
+        return self.cache.get(('slug', slug), lambda: self._get_by_slug(slug))
+
+    def get_by_id(self, pk):
+        return self.cache.get(('id', pk), lambda: self.get(pk=pk))
+
+    def _get_by_slug(self, slug):
+        return self.get(**self.slug_lookup(slug))
+
+    def slug_lookup(self, slug):
+        """Return the field lookups of the lexicon identified by slug."""
         try:
             code, topic = slug.split("@")
         except ValueError:
@@ -31,7 +146,24 @@ class LexiconManager(models.Manager):
 
         src, dst = utils.get_lexicon_languages_from_code(code)
 
-        return self.get(src_language=src, dst_language=dst, topic=topic)
+        return {'src_language': src, 'dst_language': dst, 'topic': topic}
+
+    def bump_data_version(self, lexicons=None):
+        """
+        Increase the data version of the lexicons (all by default)
+        to notify that their words have been changed.
+        """
+        qs = self.all() if lexicons is None else self.filter(pk__in=lexicons)
+        return qs.update(data_version=F('data_version') + 1, data_modified=timezone.now())
+
+    def get_data_version(self, slug=None):
+        """
+        Return the data version and the last modification of the
+        lexicon identified by slug (of every lexicon by default).
+        """
+        qs = self.all() if slug is None else self.filter(**self.slug_lookup(slug))
+        data = qs.aggregate(count=Count('id'), version=Sum('data_version'), modified=Max('data_modified'))
+        return "{count}.{version}".format(**data), data['modified']
 
 
 class Lexicon(models.Model):
@@ -54,6 +186,10 @@ class Lexicon(models.Model):
     src_language = models.CharField(max_length=2)
     dst_language = models.CharField(max_length=2)
     topic = models.CharField(max_length=32, blank=True, help_text="The subject of the lexicon.")
+    # updated when the words of the lexicon are changed (see bump_data_version)
+    # NOTE: lexicons retrieved from LexiconCache may have an outdated value
+    data_version = models.PositiveIntegerField(default=0, editable=False)
+    data_modified = models.DateTimeField(default=timezone.now, editable=False)
 
     objects = LexiconManager()
 
@@ -85,8 +221,40 @@ class Lexicon(models.Model):
         return Lexicon.objects.get(dst_language=self.src_language, src_language=self.dst_language, topic=self.topic)
 
 
-class WordManager(models.Manager):
+@receiver(post_save, sender=Lexicon)
+@receiver(post_delete, sender=Lexicon)
+def invalidate_lexicon_cache(sender, **kwargs):
+    Lexicon.objects.cache.invalidate()
+    # changes are visible by other processes when they are committed
+    transaction.on_commit(Lexicon.objects.cache.invalidate)
+
+
+class NormalizedFieldManagerMixin:
+    """
+    Fill the normalized field of the objects created in bulk, which is
+    set by a pre_save receiver on save() (bulk inserts don't send signals).
+    """
+    normalized_field = None
+
+    def normalize(self, obj):
+        raise NotImplementedError
+
+    def prepare_bulk_create(self, objs):
+        for obj in objs:
+            if not getattr(obj, self.normalized_field):
+                setattr(obj, self.normalized_field, self.normalize(obj))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.prepare_bulk_create(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class WordManager(NormalizedFieldManagerMixin, models.Manager):
     TERM_PUNCTUATION_SIGNS = '¡!¿?'
+    SEARCH_MIN_SIMILARITY = 0.3
+    NEAR_MIN_SIMILARITY = 0.2
+    normalized_field = 'normalized_term'
 
     def _clean_search_query(self, query):
         """Handle characters which breaks or generate issues with regex expression."""
@@ -101,44 +269,111 @@ class WordManager(models.Manager):
         return query
 
     def search(self, query, lex=None):
-        MIN_SIMILARITY = 0.3
         query = self._clean_search_query(query)
         qs = self._filter_by_lexicon(lex)
 
+        # ignore accents and case (see Word.normalized_term)
+        query = utils.normalize(query or '')
+
         if connection.vendor == 'postgresql':
-            iregex = r"\y{0}\y"
+            regex = r"\y{0}\y"
         elif connection.vendor == 'sqlite':
-            iregex = r"\b{0}\b"
-            return qs.filter(term__iregex=iregex.format(query))
+            regex = r"\b{0}\b"
+            qs = self._filter_by_token(qs, query)
+            return qs.filter(normalized_term__regex=regex.format(query))
         else:
             filter_query = (
-                Q(term=query) |
-                Q(term__startswith=query) |
-                Q(term__endswith=query)
+                Q(normalized_term=query) |
+                Q(normalized_term__startswith=query) |
+                Q(normalized_term__endswith=query)
             )
             return qs.filter(filter_query)
 
+        # `%` operator is backed by the trigram index of the term
         # sort results by trigram similarity
+        qs = self._filter_by_token(qs, query)
         qs = qs.filter(
-                term__iregex=iregex.format(query)
-            ).annotate(similarity=TrigramSimilarity('term', query)
-                       ).filter(similarity__gt=MIN_SIMILARITY).order_by('-similarity')
+            TrigramSimilar(F('normalized_term'), query),
+            normalized_term__regex=regex.format(query),
+        ).annotate(similarity=self._similarity(query)).filter(
+            similarity__gte=self.SEARCH_MIN_SIMILARITY,
+        ).order_by('-similarity')
         return qs
 
+    def search_or_near(self, query, lex=None):
+        """
+        Retrieve the words near the query (see search_near) with the ones
+        returned by search first, flagged by `is_search`, so falling back
+        from search to near costs a single trigram query (PostgreSQL only).
+        """
+        search_query = utils.normalize(self._clean_search_query(query) or '')
+        qs = self.search_near(query, lex)
+        if not utils.tokenize(search_query):
+            # search doesn't return any word (see _filter_by_token)
+            return qs.annotate(is_search=V(False, output_field=models.BooleanField()))
+
+        qs = qs.annotate(search_similarity=self._similarity(search_query)).annotate(
+            is_search=models.ExpressionWrapper(
+                Q(normalized_term__regex=r"\y{0}\y".format(search_query),
+                  search_similarity__gte=self.SEARCH_MIN_SIMILARITY),
+                output_field=models.BooleanField(),
+            ),
+        )
+        return qs.order_by('-is_search', '-similarity')
+
+    def _similarity(self, query):
+        # cast real to double precision so the value can be used
+        # as cursor of pagination (e.g. similarity < 0.35)
+        return Cast(TrigramSimilarity('normalized_term', query), models.FloatField())
+
+    def _filter_by_token(self, qs, query):
+        """
+        Restrict candidates to words including the longest word of the
+        query (indexed lookup) before applying the regular expression.
+        """
+        tokens = utils.tokenize(query)
+        if not tokens:
+            return qs.none()
+
+        return qs.filter(tokens__token=max(tokens, key=len))
+
     def search_near(self, query, lex=None):
         # https://docs.djangoproject.com/en/2.1/ref/contrib/postgres/search/#trigram-similarity
         # https://www.postgresql.org/docs/current/pgtrgm.html
         # 0 means totally different
-        # 1 means identical
-        MIN_SIMILARITY = 0.2
-
+        # 1 means identical (see NEAR_MIN_SIMILARITY)
         qs = self._filter_by_lexicon(lex)
-        qs = qs.annotate(
-            similarity=TrigramSimilarity('term', query),
-        ).filter(similarity__gt=MIN_SIMILARITY).order_by('-similarity')
+        query = utils.normalize(query or '')
+
+        # `%` operator is backed by the trigram index of the term
+        # instead of calculating the similarity of every word
+        qs = qs.filter(
+            TrigramSimilar(F('normalized_term'), query),
+        ).annotate(
+            similarity=self._similarity(query),
+        ).filter(
+            similarity__gte=self.NEAR_MIN_SIMILARITY,
+        ).order_by('-similarity')
 
         return qs
 
+    def normalize(self, word):
+        return utils.normalize(word.term)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        # signals aren't sent by bulk_create: keep tokens updated here
+        WordToken.objects.create_for_words(
+            [(word.pk, word.term) for word in objs if word.pk is not None],
+            batch_size=kwargs.get('batch_size') or 100,
+        )
+        return objs
+
+    def search_by_translation(self, query, lex=None):
+        """Retrieve words which have an entry whose translation includes the query."""
+        entries = Entry.objects.search_translation(query)
+        return self._filter_by_lexicon(lex).filter(pk__in=entries.values('word_id')).order_by('term')
+
     def _filter_by_lexicon(self, lex):
         if lex is None or lex == '':
             qs = self
@@ -161,11 +396,19 @@ class Word(models.Model):
     lexicon = models.ForeignKey('Lexicon', on_delete=models.CASCADE, related_name="words")
     term = models.CharField(max_length=64)
     slug = models.SlugField()
+    # term without accents & case used for searching (see utils.normalize)
+    normalized_term = models.CharField(max_length=64, editable=False)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['lexicon', 'term'], name='lexicon-term')
         ]
+        indexes = [
+            models.Index(fields=['lexicon', 'normalized_term'], name='word-lexicon-normalized-term'),
+            # requires btree_gin & pg_trgm extensions
+            GinIndex(fields=['lexicon', 'normalized_term'], opclasses=['int4_ops', 'gin_trgm_ops'],
+                     name='word-lexicon-normalized-trgm'),
+        ]
 
     objects = WordManager()
 
@@ -173,7 +416,16 @@ class Word(models.Model):
         return self.term
 
     def gramcats(self):
-        return set(self.entries.values_list('gramcats__abbreviation', flat=True))
+        if 'entries' not in getattr(self, '_prefetched_objects_cache', {}):
+            return set(self.entries.values_list('gramcats__abbreviation', flat=True))
+
+        # reuse prefetched entries (see WordSerializer.setup_eager_loading)
+        gramcats = set()
+        for entry in self.entries.all():
+            abbrs = [gramcat.abbreviation for gramcat in entry.gramcats.all()]
+            # keep the NULL returned by the query for entries without gramcats
+            gramcats.update(abbrs or [None])
+        return gramcats
 
     @property
     def admin_panel_url(self):
@@ -182,7 +434,7 @@ class Word(models.Model):
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.slug = self.calculate_slug()
         if update_fields is not None and "term" in update_fields:
-            update_fields = {"slug"}.union(update_fields)
+            update_fields = {"slug", "normalized_term"}.union(update_fields)
         super().save(
             force_insert=force_insert,
             force_update=force_update,
@@ -191,7 +443,59 @@ class Word(models.Model):
         )
 
     def calculate_slug(self):
-        return utils.calculate_slug(self.lexicon.slug, self.term)
+        if Word.lexicon.is_cached(self):
+            lexicon = self.lexicon
+        else:
+            lexicon = Lexicon.objects.get_by_id(self.lexicon_id)
+        return utils.calculate_slug(lexicon.slug, self.term)
+
+
+class WordTokenManager(models.Manager):
+    def tokens_for_words(self, words):
+        """Build (unsaved) the tokens of the words, provided as (id, term) pairs."""
+        return [
+            self.model(word_id=word_id, token=token)
+            for word_id, term in words for token in utils.tokenize(term)
+        ]
+
+    def create_for_words(self, words, batch_size=100):
+        """Create the tokens of the words, provided as (id, term) pairs."""
+        return self.bulk_create(self.tokens_for_words(words), batch_size=batch_size)
+
+    def rebuild(self, words, batch_size=100):
+        """Replace the tokens of the words, provided as (id, term) pairs."""
+        words = list(words)
+        self.filter(word_id__in=[word_id for word_id, _ in words]).delete()
+        return self.create_for_words(words, batch_size=batch_size)
+
+
+class WordToken(models.Model):
+    """
+    The WordToken class stores each word which compounds the term of
+    a Word, so searching terms which contain a whole word is an indexed
+    lookup instead of scanning every term with a regular expression.
+
+    """
+    word = models.ForeignKey('Word', on_delete=models.CASCADE, related_name="tokens")
+    token = models.CharField(max_length=64, db_index=True)
+
+    objects = WordTokenManager()
+
+    def __str__(self):
+        return self.token
+
+
+@receiver(pre_save, sender=Word)
+def update_normalized_term(sender, instance, **kwargs):
+    # NOTE: also called when loading fixtures (raw=True)
+    instance.normalized_term = utils.normalize(instance.term)
+
+
+@receiver(post_save, sender=Word)
+def update_word_tokens(sender, instance, update_fields=None, **kwargs):
+    # NOTE: also called when loading fixtures (raw=True)
+    if update_fields is None or 'term' in update_fields:
+        WordToken.objects.rebuild([(instance.pk, instance.term)])
 
 
 class Region(models.Model):
@@ -210,6 +514,46 @@ class DiatopicVariation(models.Model):
         return "{} ({})".format(self.name, self.region)
 
 
+def whole_word_regex(query):
+    """
+    Build a regular expression to look up the normalized query as
+    a whole word (`~` operator is backed by trigram indexes).
+    """
+    regex = r"\y{0}\y" if connection.vendor == 'postgresql' else r"\b{0}\b"
+    return regex.format(re.escape(utils.normalize(query)))
+
+
+class EntryManager(NormalizedFieldManagerMixin, models.Manager):
+    normalized_field = 'normalized_translation'
+
+    def search_translation(self, query):
+        """
+        Retrieve entries whose translation includes the query
+        as a whole word (ignoring accents and case).
+        """
+        query = (query or '').strip()
+        if not query:
+            return self.none()
+
+        return self.filter(normalized_translation__regex=whole_word_regex(query))
+
+    def normalize(self, entry):
+        return entry.normalize_translation()
+
+    def gramcats_for_entries(self, entries):
+        """
+        Build (unsaved) the rows of the entries gramcats relation table,
+        entries provided as (id, gramcats) pairs.
+        """
+        EntryGramcats = self.model.gramcats.through
+        return [
+            EntryGramcats(entry_id=entry_id, gramaticalcategory_id=gramcat_id)
+            for entry_id, gramcats in entries
+            # an abbreviation (or its auto correction) may be repeated
+            for gramcat_id in dict.fromkeys(gramcat.pk for gramcat in gramcats)
+        ]
+
+
 class Entry(models.Model):
     """
     The Entry class represents each translation (written in the
@@ -221,6 +565,10 @@ class Entry(models.Model):
     variation = models.ForeignKey('DiatopicVariation', null=True, on_delete=models.CASCADE, related_name="entries")
     translation = models.TextField()
     marked_translation = models.TextField(default='', blank=True)
+    # translation without tags, accents & case used for searching
+    normalized_translation = models.TextField(default='', editable=False)
+
+    objects = EntryManager()
 
     class Meta:
         # TODO instead of depend on 'pk' find another method to
@@ -232,10 +580,46 @@ class Entry(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['word', 'variation', 'translation'], name='unique-entry')
         ]
+        indexes = [
+            # requires pg_trgm extension
+            GinIndex(fields=['normalized_translation'], opclasses=['gin_trgm_ops'], name='entry-translation-trgm'),
+        ]
 
     def __str__(self):
         return self.translation
 
+    def normalize_translation(self):
+        return utils.normalize(strip_tags(self.marked_translation or self.translation))
+
+
+@receiver(pre_save, sender=Entry)
+def update_normalized_translation(sender, instance, **kwargs):
+    instance.normalized_translation = instance.normalize_translation()
+
+
+class ExampleManager(NormalizedFieldManagerMixin, models.Manager):
+    normalized_field = 'normalized_phrase'
+
+    def search_phrase(self, query, lex=None):
+        """
+        Retrieve examples whose phrase includes the query
+        as a whole word (ignoring accents and case).
+        """
+        query = (query or '').strip()
+        if not query:
+            return self.none()
+
+        qs = self.filter(normalized_phrase__regex=whole_word_regex(query))
+        if lex:
+            try:
+                qs = qs.filter(entry__word__lexicon=Lexicon.objects.get_by_slug(lex))
+            except Lexicon.DoesNotExist:
+                qs = qs.none()
+        return qs
+
+    def normalize(self, example):
+        return utils.normalize(example.phrase)
+
 
 class Example(models.Model):
     """
@@ -244,11 +628,26 @@ class Example(models.Model):
     """
     entry = models.ForeignKey('Entry', on_delete=models.CASCADE, related_name="examples")
     phrase = models.TextField()
+    # phrase without accents & case used for searching
+    normalized_phrase = models.TextField(default='', editable=False)
+
+    objects = ExampleManager()
+
+    class Meta:
+        indexes = [
+            # requires pg_trgm extension
+            GinIndex(fields=['normalized_phrase'], opclasses=['gin_trgm_ops'], name='example-phrase-trgm'),
+        ]
 
     def __str__(self):
         return self.phrase
 
 
+@receiver(pre_save, sender=Example)
+def update_normalized_phrase(sender, instance, **kwargs):
+    instance.normalized_phrase = utils.normalize(instance.phrase)
+
+
 class GramaticalCategory(models.Model):
     abbreviation = models.CharField(unique=True, max_length=64)
     title = models.CharField(max_length=128)
@@ -266,6 +665,10 @@ class VerbalConjugation(models.Model):
 
     entry = models.OneToOneField('Entry', on_delete=models.CASCADE, related_name="conjugation")
     raw = models.TextField('Raw imported content.')
+    # parsed content of raw stored to avoid parsing it on every request
+    parsed = models.JSONField(null=True, editable=False)
+    model_word_ref = models.ForeignKey('Word', null=True, editable=False,
+                                       on_delete=models.SET_NULL, related_name='+')
 
     @cached_property
     def parse_raw(self):
@@ -292,29 +695,80 @@ class VerbalConjugation(models.Model):
 
         return parsed
 
+    def parse(self, lexicon_words=None):
+        """
+        Parse raw content and store it (including the model word) on
+        `parsed` and `model_word_ref` fields.
+
+        lexicon_words -- optional mapping of term to Word id of the entry
+        lexicon to resolve the model word without querying the database.
+        """
+        self.__dict__.pop('parse_raw', None)
+        self.parsed = self.parse_raw
+
+        if self.model_word is None:
+            self.model_word_ref_id = None
+        elif lexicon_words is not None:
+            self.model_word_ref_id = lexicon_words.get(self.model_word)
+        else:
+            self.model_word_ref_id = self._retrieve_model_word_id()
+
+    def clean(self):
+        # raw content may have been changed (e.g. edited on admin)
+        self.parse()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # keep the loaded content to detect changes (raw may be deferred)
+        if 'raw' in instance.__dict__:
+            instance._loaded_raw = instance.raw
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.parsed is None or self.raw != getattr(self, '_loaded_raw', self.raw):
+            self.parse()
+        super().save(*args, **kwargs)
+        self._loaded_raw = self.raw
+
+    @property
+    def parsed_data(self):
+        return self.parse_raw if self.parsed is None else self.parsed
+
     @property
     def intro(self):
-        return self.parse_raw.get('intro', None)
+        return self.parsed_data.get('intro', None)
 
     @property
     def conjugation(self):
-        return self.parse_raw.get('conjugation', None)
+        conjugation = self.parsed_data.get('conjugation', None)
+        if conjugation is not None and self.parsed is not None:
+            # stored JSON doesn't keep moods & tenses order
+            conjugation = validators.VerbalConjugationValidator.sort_conjugation(conjugation)
+        return conjugation
 
     @property
     def model(self):
-        return self.parse_raw.get('model', None)
+        return self.parsed_data.get('model', None)
 
     @property
     def model_word(self):
-        return self.parse_raw.get('model_word', None)
+        return self.parsed_data.get('model_word', None)
 
     @property
     def model_word_id(self):
+        if self.parsed is not None and self.model_word_ref_id is not None:
+            return self.model_word_ref_id
+
+        # model word may have been created after parsing the conjugation
         if self.model_word is None:
             return None
+        return self._retrieve_model_word_id()
+
+    def _retrieve_model_word_id(self):
         try:
             return Word.objects.get(term=self.model_word, lexicon=self.entry.word.lexicon).pk
-        except Word.DoesNotExist:
+        except ObjectDoesNotExist:
             # TODO log this error to detect database inconsistency
             return None
 
@@ -331,3 +785,57 @@ class Label(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class RenderedWordManager(models.Manager):
+    @transaction.atomic
+    def rebuild(self, words, batch_size=100):
+        """
+        Render (again) words of the queryset and store the result.
+        Data version of their lexicons is increased too.
+        Returns the number of rendered words.
+        """
+        from linguatec_lexicon.serializers import RenderedWordSerializer
+
+        Lexicon.objects.bump_data_version(words.values('lexicon_id'))
+        self.filter(word__in=words).delete()
+
+        count = 0
+        rendered = []
+        words = RenderedWordSerializer.setup_eager_loading(words.order_by())
+        for word in words.iterator(chunk_size=batch_size):
+            rendered.append(RenderedWord.from_word(word))
+            if len(rendered) >= batch_size:
+                count += len(self.bulk_create(rendered))
+                rendered = []
+        count += len(self.bulk_create(rendered))
+
+        return count
+
+
+class RenderedWord(models.Model):
+    """
+    The RenderedWord class stores the serialized representation of a
+    Word, so read requests can be served with a single primary key
+    lookup instead of querying all the related models.
+
+    Fields which depend on the request (e.g. absolute URLs) are not
+    included and should be added when serving the content.
+
+    """
+    slug = models.SlugField(primary_key=True)
+    word = models.OneToOneField('Word', on_delete=models.CASCADE, related_name='rendered')
+    content = models.TextField()
+
+    objects = RenderedWordManager()
+
+    def __str__(self):
+        return self.slug
+
+    @classmethod
+    def from_word(cls, word):
+        from rest_framework.renderers import JSONRenderer
+        from linguatec_lexicon.serializers import RenderedWordSerializer
+
+        data = RenderedWordSerializer(word).data
+        return cls(slug=word.slug, word=word, content=JSONRenderer().render(data).decode('utf-8'))
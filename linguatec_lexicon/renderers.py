@@ -0,0 +1,44 @@
+"""
+Renderers of the API.
+
+FastJSONRenderer encodes the responses with orjson (when installed)
+which is several times faster than the standard library. Enable it
+on the project settings:
+    REST_FRAMEWORK = {
+        'DEFAULT_RENDERER_CLASSES': [
+            'linguatec_lexicon.renderers.FastJSONRenderer',
+            'rest_framework.renderers.BrowsableAPIRenderer',
+        ],
+    }
+
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson if it is installed (same output but escaping)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # indented output (e.g. `Accept: application/json; indent=4`) is rendered by DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # lazy strings, decimals... are encoded as DRF does
+        return orjson.dumps(data, default=self.encoder_class().default)
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Newline delimited JSON: a JSON document per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data, accepted_media_type, renderer_context) + b'\n'
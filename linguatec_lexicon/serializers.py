@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 from .models import (DiatopicVariation, Entry, Example, GramaticalCategory,
                      VerbalConjugation, Word, Lexicon)
@@ -43,6 +46,13 @@ class EntrySerializer(serializers.ModelSerializer):
         fields = ('id', 'variation', 'gramcats', 'translation', 'marked_translation',
                   'labels', 'examples', 'conjugation')
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Fetch every relation rendered by this serializer in bulk."""
+        return queryset.select_related(
+            'conjugation', 'variation__region',
+        ).prefetch_related('gramcats', 'labels', 'examples')
+
 
 class WordSerializer(serializers.ModelSerializer):
     lexicon = serializers.SlugRelatedField(slug_field='slug', read_only=True)
@@ -53,11 +63,121 @@ class WordSerializer(serializers.ModelSerializer):
         model = Word
         fields = ('id', 'slug', 'url', 'lexicon', 'term', 'gramcats', 'entries', 'admin_panel_url')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'admin_panel_url' in self.fields:
+            user = self.context['request'].user
+            if not (user.is_authenticated and user.is_staff):
+                self.fields.pop('admin_panel_url')
+
+    @staticmethod
+    def setup_eager_loading(queryset, entries=None):
+        """
+        Build the prefetch plan of the serializer tree so rendering
+        N words costs a constant number of queries.
+        Optionally, only the entries of the queryset are included.
+        """
+        entries = EntrySerializer.setup_eager_loading(entries if entries is not None else Entry.objects.all())
+        return queryset.select_related('lexicon').prefetch_related(
+            Prefetch('entries', queryset=entries),
+        )
+
+
+class RenderedWordSerializer(WordSerializer):
+    """Representation of a word stored as RenderedWord (it doesn't depend on the request)."""
+    class Meta(WordSerializer.Meta):
+        fields = ('id', 'slug', 'lexicon', 'term', 'gramcats', 'entries')
+
+
+class FlatEntrySerializer(serializers.BaseSerializer):
+    """
+    Same representation as EntrySerializer built as plain dicts from the
+    prefetched relations (see EntrySerializer.setup_eager_loading)
+    instead of the nested serializers and their fields.
+    """
+
+    def to_representation(self, entry):
+        variation = entry.variation
+        # reverse one-to-one without conjugation raises DoesNotExist (an AttributeError)
+        conjugation = getattr(entry, 'conjugation', None)
+        return {
+            'id': entry.id,
+            'variation': None if variation is None else {
+                'name': variation.name,
+                'abbreviation': variation.abbreviation,
+                'region': variation.region.name,
+            },
+            'gramcats': [
+                {'abbreviation': gramcat.abbreviation, 'title': gramcat.title}
+                for gramcat in entry.gramcats.all()
+            ],
+            'translation': entry.translation,
+            'marked_translation': entry.marked_translation,
+            'labels': [label.name for label in entry.labels.all()],
+            'examples': [{'phrase': example.phrase} for example in entry.examples.all()],
+            'conjugation': None if conjugation is None else {
+                'intro': conjugation.intro,
+                'model': conjugation.model,
+                'model_word': conjugation.model_word,
+                'model_word_id': conjugation.model_word_id,
+                'conjugation': conjugation.conjugation,
+            },
+        }
+
+
+class FlatWordSerializer(serializers.BaseSerializer):
+    """
+    Same representation as WordSerializer built as plain dicts (see
+    FlatEntrySerializer). Enable it with LINGUATEC_LEXICON_FLAT_SERIALIZERS.
+    """
+    setup_eager_loading = staticmethod(WordSerializer.setup_eager_loading)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         user = self.context['request'].user
-        if not (user.is_authenticated and user.is_staff):
-            self.fields.pop('admin_panel_url')
+        self.include_admin_panel_url = user.is_authenticated and user.is_staff
+        self.entry_serializer = FlatEntrySerializer()
+        self.url_parts = None
+
+    def get_url(self, word):
+        if self.url_parts is None:
+            # reverse the URL once and replace the pk of the words
+            url = reverse('word-detail', kwargs={'pk': 0},
+                          request=self.context['request'], format=self.context.get('format'))
+            self.url_parts = url.rsplit('0', 1)
+        return str(word.pk).join(self.url_parts)
+
+    def to_representation(self, word):
+        entries = [self.entry_serializer.to_representation(entry) for entry in word.entries.all()]
+
+        # same as Word.gramcats() without iterating the relations again
+        gramcats = set()
+        for entry in entries:
+            gramcats.update([gramcat['abbreviation'] for gramcat in entry['gramcats']] or [None])
+
+        data = {
+            'id': word.id,
+            'slug': word.slug,
+            'url': self.get_url(word),
+            'lexicon': word.lexicon.slug,
+            'term': word.term,
+            'gramcats': list(gramcats),
+            'entries': entries,
+        }
+        if self.include_admin_panel_url:
+            data['admin_panel_url'] = word.admin_panel_url
+        return data
+
+
+def word_serializer_class(serializer_class):
+    """
+    Return FlatWordSerializer instead of WordSerializer if it is
+    enabled on the project settings:
+        LINGUATEC_LEXICON_FLAT_SERIALIZERS = True
+    """
+    if serializer_class is WordSerializer and getattr(settings, 'LINGUATEC_LEXICON_FLAT_SERIALIZERS', False):
+        return FlatWordSerializer
+    return serializer_class
 
 
 class WordNearSerializer(serializers.ModelSerializer):
@@ -66,6 +186,23 @@ class WordNearSerializer(serializers.ModelSerializer):
         fields = ('id', 'slug', 'url', 'term')
 
 
+class ExampleSearchSerializer(serializers.ModelSerializer):
+    """Example including the entry and the word which it belongs to."""
+    entry = serializers.SerializerMethodField()
+    word = WordNearSerializer(source='entry.word', read_only=True)
+
+    class Meta:
+        model = Example
+        fields = ('id', 'phrase', 'entry', 'word')
+
+    def get_entry(self, obj):
+        return {'id': obj.entry.id, 'translation': obj.entry.translation}
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('entry__word')
+
+
 class LexiconSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lexicon
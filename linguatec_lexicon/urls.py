@@ -7,6 +7,7 @@ router = routers.DefaultRouter()
 router.register(r'lexicons', views.LexiconViewSet)
 router.register(r'words', views.WordViewSet)
 router.register(r'gramcats', views.GramaticalCategoryViewSet)
+router.register(r'examples', views.ExampleViewSet, basename='example')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,5 +1,6 @@
 import hashlib
 import re
+import unicodedata
 
 
 def get_lexicon_languages_from_code(lex_code):
@@ -19,3 +20,20 @@ def calculate_slug(lexicon_slug, word_term):
     data = f"{lexicon_slug}|{word_term}"
     encoded_data = data.encode('utf-8')
     return hashlib.md5(encoded_data).hexdigest()
+
+
+def normalize(text):
+    """
+    Remove accents and case of text to compare it ignoring them
+    e.g. "Aragonés" and "aragones" or "niño" and "nino".
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """
+    Split text into the (normalized) words which compounds it, as
+    splitted by word boundaries of regular expressions (i.e. \\y or \\b).
+    """
+    return set(re.findall(r'\w+', normalize(text)))
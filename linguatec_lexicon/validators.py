@@ -154,6 +154,16 @@ class VerbalConjugationValidator:
 
         return cleaned_data
 
+    @classmethod
+    def sort_conjugation(cls, conjugation):
+        """Sort moods and tenses of a cleaned conjugation."""
+        return collections.OrderedDict(
+            (mood, collections.OrderedDict(
+                (tense, conjugation[mood][tense]) for tense in cls.MOOD_TENSES[mood]
+            ))
+            for mood in cls.MOODS
+        )
+
     def extract_mood(self, value, mood):
         mood_idx = self.MOODS.index(mood)
         next_mood = self.MOODS[mood_idx + 1] if mood_idx + \
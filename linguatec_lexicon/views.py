@@ -1,20 +1,36 @@
+import collections
+import collections.abc
+import datetime
+import hashlib
 import json
 import os
+import re
 import tempfile
 from io import StringIO
 
 from django.core.management import call_command
-from django.http import Http404
+from django.db import connection
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.text import compress_sequence
 from django.views.generic.base import TemplateView
-from rest_framework import generics, viewsets
+from rest_framework import generics, mixins, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.reverse import reverse
 
+from . import utils
+from .bundle import list_bundles
+from .cache import response_cache, term_index_cache
 from .forms import ValidatorForm
-from .models import GramaticalCategory, Word, Lexicon
-from .serializers import GramaticalCategorySerializer, WordSerializer, WordNearSerializer, LexiconSerializer
+from .models import Entry, Example, GramaticalCategory, Word, WordManager, Lexicon, RenderedWord
+from .renderers import NDJSONRenderer
+from .serializers import (ExampleSearchSerializer, GramaticalCategorySerializer, LexiconSerializer,
+                          WordNearSerializer, WordSerializer, word_serializer_class)
 from .validators import validate_lexicon_slug
 
 
@@ -84,24 +100,403 @@ class DefaultLimitOffsetPagination(LimitOffsetPagination):
     max_limit = 100
 
 
-class LexiconViewSet(viewsets.ReadOnlyModelViewSet):
+class HasNextLimitOffsetPagination(DefaultLimitOffsetPagination):
+    """
+    Limit offset pagination which doesn't count the results: it
+    fetches an extra item to know if there is a next page.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        del schema['properties']['count']
+        schema['required'].remove('count')
+        return schema
+
+
+class WordCursorPagination(CursorPagination):
+    """
+    Keyset pagination (no OFFSET neither COUNT query) which
+    sorts by the `cursor_ordering` of the view (if defined).
+    """
+    page_size = DefaultLimitOffsetPagination.default_limit
+    page_size_query_param = 'limit'
+    max_page_size = DefaultLimitOffsetPagination.max_limit
+    ordering = ('term', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', None) or self.ordering
+
+
+class PaginationModeMixin:
+    """
+    Allow clients to choose the pagination using the query param
+    `pagination` (e.g. `?pagination=cursor`). By default, the
+    `pagination_class` of the view is used.
+    """
+    pagination_mode_param = 'pagination'
+    pagination_modes = {}
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(self.pagination_mode_param)
+            pagination_class = self.pagination_modes.get(mode, self.pagination_class)
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
+
+
+def parse_byte_range(header, size):
+    """
+    Return the (first, last) byte positions requested by a Range header
+    or None if the whole content should be sent (no header, multiple
+    ranges or invalid syntax). Raise ValueError if it isn't satisfiable.
+    """
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', (header or '').strip())
+    if match is None or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - int(last), 0), size - 1
+
+    first, last = int(first), min(int(last), size - 1) if last else size - 1
+    if first >= size:
+        raise ValueError("Unsatisfiable range")
+    if last < first:
+        return None
+    return first, last
+
+
+def read_file_range(path, first, last, block_size=FileResponse.block_size):
+    with open(path, 'rb') as f:
+        f.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            data = f.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def bad_request_response(error):
+    """Answer 400 describing the error of the request (e.g. an invalid parameter)."""
+    return Response(
+        data={"code": 400, "message": "Bad Request", "details": str(error)},
+        status=400,
+    )
+
+
+class EarlyResponse(Exception):
+    """Raised to answer a request without calling the handler."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class DataVersionMixin:
+    """
+    Conditional GET based on the data version of the lexicons: answer
+    304 Not Modified (without querying neither serializing the data)
+    when the client already has the current version (ETag or Last-Modified).
+    """
+    # query param with the slug of the lexicon (otherwise every lexicon is considered)
+    data_version_lexicon_param = 'l'
+
+    def get_data_version_lexicon(self, request):
+        """Slug of the lexicon of the response (None if it isn't limited to a lexicon)."""
+        return request.query_params.get(self.data_version_lexicon_param) or None
+
+    def get_data_version(self, request):
+        slug = self.get_data_version_lexicon(request)
+        try:
+            version, modified = Lexicon.objects.get_data_version(slug)
+        except ValueError:
+            # invalid lexicon slug
+            version, modified = Lexicon.objects.get_data_version()
+        return '{}|{}'.format(version, modified), modified
+
+    def get_etag(self, request, data_version):
+        # response depends on the user and on the format too
+        data = '{}|{}|{}'.format(data_version, request.user.is_staff, request.accepted_renderer.format)
+        return '"{}"'.format(hashlib.md5(data.encode('utf-8')).hexdigest())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.data_version = self.data_etag = self.data_modified = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        self.data_version, self.data_modified = self.get_data_version(request)
+        self.data_etag = self.get_etag(request, self.data_version)
+        last_modified = int(self.data_modified.timestamp()) if self.data_modified else None
+        response = get_conditional_response(request, etag=self.data_etag, last_modified=last_modified)
+        if response is not None:
+            raise EarlyResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'data_etag', None) and response.status_code == 200:
+            response.headers['ETag'] = self.data_etag
+            if self.data_modified:
+                response.headers['Last-Modified'] = http_date(self.data_modified.timestamp())
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Cache the responses of `cached_actions` using the data version
+    of the lexicons as part of the key (see linguatec_lexicon.cache).
+    It requires DataVersionMixin (which answers the cached responses).
+    """
+    cached_actions = ()
+
+    def get_response_cache_params(self, request):
+        params = request.query_params.dict()
+        # links of the response include the host
+        params['_host'] = request.build_absolute_uri('/')
+        return params
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.response_cache_key = None
+        if request.method != 'GET' or self.action not in self.cached_actions or not response_cache.enabled:
+            return
+        # browsable API responses depend on the request (e.g. CSRF token)
+        if request.accepted_renderer.format != 'json':
+            return
+
+        self.response_cache_key = response_cache.make_key(
+            '{}.{}'.format(type(self).__name__, self.action),
+            self.get_response_cache_params(request),
+            self.data_etag,
+        )
+        cached = response_cache.get(self.response_cache_key)
+        if cached is not None:
+            self.response_cache_key = None
+            content_type, content = cached
+            response = HttpResponse(content, content_type=content_type)
+            response.headers['X-Cache'] = 'HIT'
+            raise EarlyResponse(response)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'response_cache_key', None) and response.status_code == 200:
+            if hasattr(response, 'render'):
+                response.render()
+            response_cache.set(self.response_cache_key, response.headers['Content-Type'], response.content)
+            response.headers['X-Cache'] = 'MISS'
+        return response
+
+
+class FlatWordSerializerMixin:
+    """
+    Serialize words with FlatWordSerializer when it is enabled
+    (see LINGUATEC_LEXICON_FLAT_SERIALIZERS setting).
+    """
+
+    def get_serializer_class(self):
+        return word_serializer_class(super().get_serializer_class())
+
+
+class RenderedWordMixin:
+    """
+    Serve words stored as RenderedWord without querying related models.
+    """
+
+    def get_rendered_word_response(self, slug):
+        request = self.request
+        if request.accepted_renderer.format != 'json' or request.user.is_staff:
+            # browsable API and admin_panel_url requires the serializer
+            return None
+
+        try:
+            word_id, content = RenderedWord.objects.values_list('word_id', 'content').get(slug=slug)
+        except RenderedWord.DoesNotExist:
+            return None
+
+        # add fields which depend on the request without decoding stored JSON
+        url = reverse('word-detail', kwargs={'pk': word_id}, request=request)
+        content = '{"url":' + json.dumps(url) + ',' + content[1:]
+        return HttpResponse(content, content_type='application/json')
+
+
+class LexiconViewSet(DataVersionMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows lexicons to be viewed.
     """
     queryset = Lexicon.objects.all().order_by('src_language', 'dst_language')
     serializer_class = LexiconSerializer
     pagination_class = DefaultLimitOffsetPagination
+    dump_chunk_size = 500
 
+    def get_lexicon(self):
+        """Lexicon identified by the slug (or the id) of the URL."""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            if lookup.isdigit():
+                return Lexicon.objects.get_by_id(int(lookup))
+            return Lexicon.objects.get_by_slug(lookup)
+        except (Lexicon.DoesNotExist, ValueError):
+            raise Http404()
 
-class WordViewSet(viewsets.ReadOnlyModelViewSet):
+    def get_data_version_lexicon(self, request):
+        if self.action == 'dump':
+            return self.get_lexicon().slug
+        return super().get_data_version_lexicon(request)
+
+    def get_data_version(self, request):
+        if self.action == 'bundle':
+            # the version of the served bundle (it may be older than the data)
+            path, version = self.get_bundle(request)
+            modified = datetime.datetime.fromtimestamp(os.path.getmtime(path), tz=datetime.timezone.utc)
+            return 'bundle|{}'.format(version), modified
+        return super().get_data_version(request)
+
+    def get_bundle(self, request):
+        """Return path and version of the requested bundle (by default, the latest one)."""
+        if not hasattr(self, '_bundle'):
+            bundles = list_bundles(self.get_lexicon())
+            version = request.query_params.get('v')
+            if version is None and bundles:
+                version = max(bundles)
+            try:
+                self._bundle = bundles[int(version)], int(version)
+            except (KeyError, TypeError, ValueError):
+                raise Http404()
+        return self._bundle
+
+    @action(detail=True, renderer_classes=[NDJSONRenderer])
+    def dump(self, request, pk=None, format=None):
+        """
+        Stream every word of the lexicon, a word per line, e.g.
+        `/lexicons/es-ar/dump.ndjson`. Words are fetched in chunks
+        using a server side cursor so memory usage doesn't depend on
+        the size of the lexicon. It is compressed if client accepts gzip.
+        """
+        lexicon = self.get_lexicon()
+        words = WordSerializer.setup_eager_loading(lexicon.words.order_by('term', 'id'))
+
+        # a single serializer renders every word
+        serializer = word_serializer_class(WordSerializer)(context=self.get_serializer_context())
+        renderer = request.accepted_renderer
+        content = (
+            renderer.render(serializer.to_representation(word))
+            for word in words.iterator(chunk_size=self.dump_chunk_size)
+        )
+
+        gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if gzip:
+            content = compress_sequence(content)
+
+        response = StreamingHttpResponse(content, content_type=renderer.media_type)
+        response.headers['Content-Disposition'] = 'attachment; filename="{}.ndjson"'.format(lexicon.slug)
+        if gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    @action(detail=True)
+    def bundle(self, request, pk=None):
+        """
+        Download the offline bundle of the lexicon (see `buildbundle`
+        command), the latest one or the version requested as `v`.
+        It supports a single byte `Range` to resume downloads.
+        """
+        path, version = self.get_bundle(request)
+        size = os.path.getsize(path)
+        filename = os.path.basename(path)
+
+        byte_range = None
+        # resume only if the bundle is the same (If-Range has the ETag)
+        if request.headers.get('If-Range', self.data_etag) == self.data_etag:
+            try:
+                byte_range = parse_byte_range(request.headers.get('Range'), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response.headers['Content-Range'] = 'bytes */{}'.format(size)
+                return response
+
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), as_attachment=True, filename=filename,
+                                    content_type='application/vnd.sqlite3')
+        else:
+            first, last = byte_range
+            response = StreamingHttpResponse(read_file_range(path, first, last), status=206,
+                                             content_type='application/vnd.sqlite3')
+            response.headers['Content-Length'] = last - first + 1
+            response.headers['Content-Range'] = 'bytes {}-{}/{}'.format(first, last, size)
+            response.headers['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+            response.headers['ETag'] = self.data_etag
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+
+class WordViewSet(ResponseCacheMixin, DataVersionMixin, PaginationModeMixin, RenderedWordMixin,
+                  FlatWordSerializerMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows words to be viewed.
     """
     queryset = Word.objects.all().order_by('term')
     serializer_class = WordSerializer
     pagination_class = DefaultLimitOffsetPagination
-
-    @action(detail=False)
+    pagination_modes = {
+        'cursor': WordCursorPagination,
+        'hasnext': HasNextLimitOffsetPagination,
+    }
+    cursor_ordering = None
+    max_batch_terms = 300
+    autocomplete_default_limit = 10
+    autocomplete_max_limit = 50
+    cached_actions = ('search', 'near', 'exact', 'lookup')
+
+    def get_response_cache_params(self, request):
+        params = super().get_response_cache_params(request)
+        # search & near ignore accents and case (see Word.normalized_term)
+        if self.action in ('search', 'near') and 'q' in params:
+            params['q'] = utils.normalize(params['q'].strip())
+        return params
+
+    def get_queryset(self):
+        return WordSerializer.setup_eager_loading(super().get_queryset())
+
+    @action(detail=False, cursor_ordering=('-similarity', 'id'))
     def near(self, request):
         self.serializer_class = WordNearSerializer
         query = self.request.query_params.get('q', None)
@@ -117,14 +512,14 @@ class WordViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-    @action(detail=False)
+    @action(detail=False, cursor_ordering=('-similarity', 'id'))
     def search(self, request):
         query = self.request.query_params.get('q', None)
         lex = self.request.query_params.get('l', '')
         if query is not None:
             query = query.strip()
         lex = lex.strip()
-        queryset = Word.objects.search(query, lex)
+        queryset = WordSerializer.setup_eager_loading(Word.objects.search(query, lex))
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -141,28 +536,233 @@ class WordViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             validate_lexicon_slug(lex)
         except ValueError as e:
-            return Response(
-                data={"code": 400, "message": "Bad Requset", "details": str(e)},
-                status=400,
-            )
+            return bad_request_response(e)
+
+        if term is not None:
+            response = self.get_rendered_word_response(utils.calculate_slug(lex, term))
+            if response is not None:
+                return response
 
         try:
             lexicon = Lexicon.objects.get_by_slug(lex)
-            instance = lexicon.words.get(term=term)
-        except (Lexicon.DoesNotExist, Word.DoesNotExist):
+        except Lexicon.DoesNotExist:
+            raise Http404()
+
+        instance = self.get_exact_word(lexicon, term)
+        if instance is None:
             raise Http404()
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
+    def get_exact_word(self, lexicon, term):
+        if term is None:
+            return None
+
+        # ignore accents and case but prefer the word which matches the term
+        words = WordSerializer.setup_eager_loading(lexicon.words.all())
+        words = list(words.filter(normalized_term=utils.normalize(term)))
+        if not words:
+            return None
+        return min(words, key=lambda word: (word.term != term, word.term))
+
+    @action(detail=False)
+    def lookup(self, request):
+        """
+        Look up q on the lexicon l trying exact, search and near
+        (in this order) until one of them returns any word.
+        The response includes which one matched as `tier`.
+        """
+        lex = request.query_params.get('l', '').strip()
+        query = request.query_params.get('q', '').strip()
+
+        try:
+            validate_lexicon_slug(lex)
+        except ValueError as e:
+            return bad_request_response(e)
+
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lex)
+        except Lexicon.DoesNotExist:
+            return Response({'tier': None, 'results': []})
+
+        limit = DefaultLimitOffsetPagination().get_limit(request)
+
+        word = self.get_exact_word(lexicon, query)
+        if word is not None:
+            tier, words, serializer_class = 'exact', [word], word_serializer_class(WordSerializer)
+        else:
+            tier, words, serializer_class = self.lookup_search_or_near(query, lex, limit)
+
+        serializer = serializer_class(words, many=True, context=self.get_serializer_context())
+        return Response({
+            'tier': tier if words else None,
+            'results': serializer.data,
+        })
+
+    def lookup_search_or_near(self, query, lex, limit):
+        """
+        Retrieve the words of search or, if none, the ones of near
+        running a single trigram query on PostgreSQL.
+        """
+        search_serializer_class = word_serializer_class(WordSerializer)
+        if connection.vendor != 'postgresql':
+            words = list(WordSerializer.setup_eager_loading(Word.objects.search(query, lex))[:limit])
+            return 'search', words, search_serializer_class
+
+        words = list(Word.objects.search_or_near(query, lex)[:limit])
+        if not words or not words[0].is_search:
+            return 'near', words, WordNearSerializer
+
+        # fetch the relations of the words by pk keeping the search order
+        ids = [word.pk for word in words if word.is_search]
+        words = WordSerializer.setup_eager_loading(Word.objects.filter(pk__in=ids)).in_bulk(ids)
+        return 'search', [words[pk] for pk in ids], search_serializer_class
+
+    @action(detail=False, url_path='by-translation')
+    def by_translation(self, request):
+        """
+        Reverse search: list the words with a translation which includes
+        the value of q (only matched entries are included).
+        """
+        query = request.query_params.get('q', None)
+        lex = request.query_params.get('l', '').strip()
+
+        if lex:
+            try:
+                validate_lexicon_slug(lex)
+            except ValueError as e:
+                return bad_request_response(e)
+
+        queryset = WordSerializer.setup_eager_loading(
+            Word.objects.search_by_translation(query, lex),
+            entries=Entry.objects.search_translation(query),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False)
+    def autocomplete(self, request):
+        """
+        Complete the prefix q with the terms of the lexicon l
+        (ignoring accents and case) without querying the words.
+        """
+        lex = request.query_params.get('l', '')
+        query = request.query_params.get('q', '')
 
-class WordDetailBySlug(generics.RetrieveAPIView):
+        try:
+            validate_lexicon_slug(lex)
+            limit = min(int(request.query_params.get('limit', self.autocomplete_default_limit)),
+                        self.autocomplete_max_limit)
+        except ValueError as e:
+            return bad_request_response(e)
+
+        prefix = utils.normalize(query.strip().lstrip(WordManager.TERM_PUNCTUATION_SIGNS))
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lex)
+        except Lexicon.DoesNotExist:
+            results = []
+        else:
+            index = term_index_cache.get(lexicon, self.data_version)
+            results = index.complete(prefix, limit) if prefix else []
+
+        return Response({'results': [{'term': term, 'slug': slug} for term, slug in results]})
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Exact search of several terms of a lexicon, e.g.
+        `{"l": "es-ar", "q": ["casa", "perro"]}`
+        Results are keyed by term and missing terms are listed.
+        """
+        try:
+            if not isinstance(request.data, collections.abc.Mapping):
+                raise ValueError("Body should be an object including `l` and `q`.")
+            lex = request.data.get('l', '')
+            terms = request.data.get('q')
+            validate_lexicon_slug(lex)
+            self.validate_batch_terms(terms)
+        except ValueError as e:
+            return bad_request_response(e)
+
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lex)
+        except Lexicon.DoesNotExist:
+            raise Http404()
+
+        # group words by normalized term (see exact)
+        words = collections.defaultdict(list)
+        queryset = WordSerializer.setup_eager_loading(lexicon.words.all())
+        for word in queryset.filter(normalized_term__in={utils.normalize(term) for term in terms}):
+            words[word.normalized_term].append(word)
+
+        results = {}
+        missing = []
+        for term in terms:
+            candidates = words.get(utils.normalize(term))
+            if candidates:
+                results[term] = min(candidates, key=lambda word: (word.term != term, word.term))
+            elif term not in missing:
+                missing.append(term)
+
+        serializer = self.get_serializer(list(results.values()), many=True)
+        return Response({
+            'results': dict(zip(results, serializer.data)),
+            'missing': missing,
+        })
+
+    def validate_batch_terms(self, terms):
+        if not isinstance(terms, list) or not all(isinstance(term, str) for term in terms):
+            raise ValueError("q should be a list of terms.")
+        if len(terms) > self.max_batch_terms:
+            raise ValueError("Up to {} terms can be retrieved in a query.".format(self.max_batch_terms))
+
+
+class WordDetailBySlug(DataVersionMixin, RenderedWordMixin, FlatWordSerializerMixin, generics.RetrieveAPIView):
     queryset = Word.objects.all()
     lookup_field = 'slug'
     serializer_class = WordSerializer
 
+    def get_queryset(self):
+        return WordSerializer.setup_eager_loading(super().get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        response = self.get_rendered_word_response(kwargs[self.lookup_field])
+        if response is not None:
+            return response
+        return super().retrieve(request, *args, **kwargs)
+
+
+class ExampleViewSet(DataVersionMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    API endpoint that allows examples to be searched
+    (by a word included on their phrase).
+    """
+    serializer_class = ExampleSearchSerializer
+    pagination_class = DefaultLimitOffsetPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', None)
+        lex = self.request.query_params.get('l', '').strip()
+        queryset = Example.objects.search_phrase(query, lex).order_by('pk')
+        return ExampleSearchSerializer.setup_eager_loading(queryset)
+
+    def list(self, request, *args, **kwargs):
+        lex = request.query_params.get('l', '').strip()
+        if lex:
+            try:
+                validate_lexicon_slug(lex)
+            except ValueError as e:
+                return bad_request_response(e)
+        return super().list(request, *args, **kwargs)
+
 
-class GramaticalCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class GramaticalCategoryViewSet(DataVersionMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows words to be retrieved.
     """
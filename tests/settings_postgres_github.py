@@ -25,6 +25,9 @@ DATABASES = {
 
 SECRET_KEY = "django_tests_secret_key"
 
+# Cache lexicons (tests run in a single process, local memory cache is enough)
+LINGUATEC_LEXICON_LEXICON_CACHE = 'default'
+
 # Use a fast hasher to speed up tests.
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -1,7 +1,23 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
 import unittest
+from io import StringIO
 
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db import connection
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from linguatec_lexicon import views
+from linguatec_lexicon.renderers import FastJSONRenderer
+from linguatec_lexicon.models import (DiatopicVariation, Entry, Label,
+                                      Lexicon, Region, RenderedWord,
+                                      VerbalConjugation, Word)
 
 
 class ApiTestCase(TestCase):
@@ -29,6 +45,35 @@ class ApiTestCase(TestCase):
         resp_json = resp.json()
         self.assertEqual(0, resp_json["count"])
 
+    def test_word_batch(self):
+        data = {"l": "es-ar", "q": ["Ebrio", "echar", "foo", "Ebrio"]}
+        resp = self.client.post('/api/words/batch/', data, content_type='application/json')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(["Ebrio", "echar"], list(resp_json["results"]))
+        self.assertEqual("ebrio", resp_json["results"]["Ebrio"]["term"])
+        self.assertEqual(["foo"], resp_json["missing"])
+
+    def test_word_batch_invalid_terms(self):
+        resp = self.client.post('/api/words/batch/', {"l": "es-ar", "q": "echar"}, content_type='application/json')
+        self.assertEqual(400, resp.status_code)
+
+        data = {"l": "es-ar", "q": ["echar"] * 301}
+        resp = self.client.post('/api/words/batch/', data, content_type='application/json')
+        self.assertEqual(400, resp.status_code)
+
+    def test_word_batch_invalid_body(self):
+        for data in (["echar"], "echar", 1):
+            resp = self.client.post('/api/words/batch/', json.dumps(data), content_type='application/json')
+            self.assertEqual(400, resp.status_code)
+            self.assertEqual({"code": 400, "message": "Bad Request"}, {
+                key: value for key, value in resp.json().items() if key != "details"})
+
+    def test_word_batch_does_not_exist_lexicon(self):
+        resp = self.client.post('/api/words/batch/', {"l": "en-zn", "q": ["foo"]}, content_type='application/json')
+        self.assertEqual(404, resp.status_code)
+
     def test_word_search_does_not_exist_lexicon(self):
         resp = self.client.get('/api/words/search/?q=foo&l=en-zn')
         self.assertEqual(200, resp.status_code)
@@ -37,6 +82,660 @@ class ApiTestCase(TestCase):
         self.assertEqual(0, resp_json["count"])
 
 
+class WordQueriesTestCase(TestCase):
+    """Rendering a page of words should cost a constant number of queries."""
+    fixtures = ['lexicon-sample.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name="Ribagorza")
+        variation = DiatopicVariation.objects.create(name="benasqués", abbreviation="Benas.", region=region)
+        label = Label.objects.create(name="fauna", lexicon_id=1)
+        for word in Word.objects.all():
+            entry = Entry.objects.create(word=word, translation="variant", variation=variation)
+            label.entries.add(entry)
+            VerbalConjugation.objects.create(entry=entry, raw="Lorem ipsum.")
+
+    def setUp(self):
+        # lexicons are cached (retrieved once per process)
+        # but every request queries their data version (see DataVersionMixin)
+        Lexicon.objects.get_by_slug("es-ar")
+
+    def assertNumQueriesIndependentOfPageSize(self, num, url):
+        for limit in [1, 100]:
+            with self.assertNumQueries(num):
+                resp = self.client.get(url + '&limit={}'.format(limit))
+            self.assertEqual(200, resp.status_code)
+
+    def test_word_list(self):
+        self.assertNumQueriesIndependentOfPageSize(7, '/api/words/?')
+
+    def test_word_search(self):
+        self.assertNumQueriesIndependentOfPageSize(7, '/api/words/search/?q=edad&l=es-ar')
+
+    def test_word_show(self):
+        with self.assertNumQueries(6):
+            resp = self.client.get('/api/words/1/')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_exact(self):
+        # +1 query looking for the rendered word
+        with self.assertNumQueries(7):
+            resp = self.client.get('/api/words/exact/?q=ebrio&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_batch(self):
+        for terms in [["ebrio"], ["ebrio", "echar", "eclipsar", "edad"]]:
+            with self.assertNumQueries(5):
+                resp = self.client.post('/api/words/batch/', {"l": "es-ar", "q": terms},
+                                        content_type='application/json')
+            self.assertEqual(len(terms), len(resp.json()["results"]))
+
+    def test_word_detail_by_slug(self):
+        word = Word.objects.get(pk=1)
+        word.save()
+        # +1 query looking for the rendered word
+        with self.assertNumQueries(7):
+            resp = self.client.get('/api/words/slug/{}/'.format(word.slug))
+        self.assertEqual(200, resp.status_code)
+
+
+class RenderedWordTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        # calculate slugs (not included on fixtures)
+        for word in Word.objects.all():
+            word.save()
+        cls.word = Word.objects.get(pk=1)
+
+    def test_word_detail_by_slug(self):
+        url = '/api/words/slug/{}/'.format(self.word.slug)
+        expected = self.client.get(url).json()
+
+        call_command('renderwords', stdout=StringIO())
+        # data version (ETag) & rendered word
+        with self.assertNumQueries(2):
+            resp = self.client.get(url)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(expected, resp.json())
+
+    def test_word_exact(self):
+        url = '/api/words/exact/?q=ebrio&l=es-ar'
+        expected = self.client.get(url).json()
+
+        call_command('renderwords', 'es-ar', stdout=StringIO())
+        with self.assertNumQueries(2):
+            resp = self.client.get(url)
+        self.assertEqual(expected, resp.json())
+
+    def test_word_exact_ignores_accents_and_case(self):
+        resp = self.client.get('/api/words/exact/?q=Ébrio&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual("ebrio", resp.json()["term"])
+
+    def test_staff_user_includes_admin_panel_url(self):
+        call_command('renderwords', stdout=StringIO())
+        user = User.objects.create_user('admin', is_staff=True)
+        self.client.force_login(user)
+
+        resp = self.client.get('/api/words/slug/{}/'.format(self.word.slug))
+        self.assertIn('admin_panel_url', resp.json())
+
+    def test_rebuild_after_marktranslations(self):
+        call_command('renderwords', stdout=StringIO())
+        Lexicon.objects.create(name="ar-es", src_language="ar", dst_language="es")
+        Word.objects.create(term="capino/a", lexicon=Lexicon.objects.get(src_language="ar"))
+        call_command('marktranslations', stdout=StringIO())
+
+        rendered = RenderedWord.objects.get(slug=self.word.slug)
+        self.assertIn("<trans word=", rendered.content)
+
+    def test_rebuild_after_admin_change_of_gramcat(self):
+        call_command('renderwords', stdout=StringIO())
+        self.client.force_login(User.objects.create_superuser('admin'))
+        gramcat = self.word.entries.get().gramcats.get()
+        resp = self.client.post('/admin/linguatec_lexicon/gramaticalcategory/{}/change/'.format(gramcat.pk), {
+            'abbreviation': gramcat.abbreviation, 'title': 'new title',
+        })
+        self.assertEqual(302, resp.status_code)
+
+        # staff users aren't served rendered words
+        self.client.logout()
+        resp = self.client.get('/api/words/slug/{}/'.format(self.word.slug))
+        self.assertEqual('new title', resp.json()['entries'][0]['gramcats'][0]['title'])
+
+    def test_rebuild_after_admin_change_of_region(self):
+        region = Region.objects.create(name="Ribagorza")
+        variation = DiatopicVariation.objects.create(name="benasqués", abbreviation="Benas.", region=region)
+        Entry.objects.create(word=self.word, variation=variation, translation="capín")
+        call_command('renderwords', stdout=StringIO())
+        self.client.force_login(User.objects.create_superuser('admin'))
+        resp = self.client.post('/admin/linguatec_lexicon/region/{}/change/'.format(region.pk), {'name': 'Ribagorça'})
+        self.assertEqual(302, resp.status_code)
+
+        self.client.logout()
+        resp = self.client.get('/api/words/slug/{}/'.format(self.word.slug))
+        self.assertIn('Ribagorça', [entry['variation']['region'] for entry in resp.json()['entries']
+                                    if entry['variation']])
+
+        self.client.force_login(User.objects.get(username='admin'))
+        resp = self.client.post('/admin/linguatec_lexicon/diatopicvariation/{}/delete/'.format(variation.pk),
+                                {'post': 'yes'})
+        self.assertEqual(302, resp.status_code)
+        self.client.logout()
+        resp = self.client.get('/api/words/slug/{}/'.format(self.word.slug))
+        self.assertEqual(1, len(resp.json()['entries']))
+
+    def test_rebuild_after_importgramcat_purge(self):
+        call_command('renderwords', stdout=StringIO())
+        gramcat_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'linguatec_lexicon', 'fixtures', 'gramcat-es-ar.csv')
+        call_command('importgramcat', gramcat_path, purge=True, verbosity=0)
+
+        resp = self.client.get('/api/words/slug/{}/'.format(self.word.slug))
+        self.assertEqual([], resp.json()['entries'][0]['gramcats'])
+
+
+class DataVersionTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_not_modified(self):
+        for url in ['/api/words/?', '/api/words/1/?', '/api/words/search/?q=echar&l=es-ar',
+                    '/api/lexicons/?', '/api/gramcats/?']:
+            resp = self.client.get(url)
+            self.assertEqual(200, resp.status_code)
+            self.assertIn('ETag', resp.headers)
+            self.assertIn('Last-Modified', resp.headers)
+
+            with self.assertNumQueries(1):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=resp.headers['ETag'])
+            self.assertEqual(304, resp.status_code)
+
+    def test_modified_on_rebuild(self):
+        url = '/api/words/exact/?q=echar&l=es-ar'
+        etag = self.client.get(url).headers['ETag']
+
+        RenderedWord.objects.rebuild(Word.objects.filter(term="echar"))
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, resp.status_code)
+        self.assertNotEqual(etag, resp.headers['ETag'])
+
+    def test_lexicon_version(self):
+        url = '/api/words/exact/?q=echar&l=es-ar'
+        etag = self.client.get(url).headers['ETag']
+
+        # other lexicons changes don't modify the data
+        lexicon = Lexicon.objects.create(name="ar-es", src_language="ar", dst_language="es")
+        Lexicon.objects.bump_data_version([lexicon.pk])
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, resp.status_code)
+
+        self.assertNotEqual(etag, self.client.get('/api/words/').headers['ETag'])
+
+    def test_modified_on_admin_delete(self):
+        url = '/api/words/?l=es-ar'
+        etag = self.client.get(url).headers['ETag']
+
+        self.client.force_login(User.objects.create_superuser('admin'))
+        resp = self.client.post('/admin/linguatec_lexicon/word/1/delete/', {'post': 'yes'})
+        self.assertEqual(302, resp.status_code)
+        self.client.logout()
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, resp.status_code)
+        self.assertNotIn(1, [word['id'] for word in resp.json()['results']])
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get('/api/words/1/').headers['ETag']
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.assertNotEqual(etag, self.client.get('/api/words/1/').headers['ETag'])
+
+
+class ByTranslationTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_by_translation(self):
+        resp = self.client.get('/api/words/by-translation/?q=chitar&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(["echar"], [word["term"] for word in resp_json["results"]])
+        # only matched entries are included
+        translations = [entry["translation"] for entry in resp_json["results"][0]["entries"]]
+        self.assertEqual(2, len(translations))
+        self.assertTrue(all("chitar" in translation for translation in translations))
+
+    def test_ignore_accents_and_whole_words(self):
+        resp = self.client.get('/api/words/by-translation/?q=EDA&l=es-ar')
+        self.assertEqual(["edad"], [word["term"] for word in resp.json()["results"]])
+
+        resp = self.client.get('/api/words/by-translation/?q=chit&l=es-ar')
+        self.assertEqual(0, resp.json()["count"])
+
+    def test_marked_translation(self):
+        entry = Entry.objects.get(translation="tiempo")
+        entry.marked_translation = "<trans word=1>tiempo</trans>"
+        entry.save()
+        self.assertEqual("tiempo", entry.normalized_translation)
+
+    def test_num_queries(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        # data version, count, words & entries prefetch plan
+        with self.assertNumQueries(7):
+            self.client.get('/api/words/by-translation/?q=chitar&l=es-ar')
+
+    def test_invalid_lexicon(self):
+        resp = self.client.get('/api/words/by-translation/?q=casa&l=invalid')
+        self.assertEqual(400, resp.status_code)
+
+
+class LexiconDumpTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def dump(self, url='/api/lexicons/es-ar/dump.ndjson', **extra):
+        resp = self.client.get(url, **extra)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('application/x-ndjson', resp['Content-Type'])
+        return resp, b''.join(resp.streaming_content)
+
+    def test_dump(self):
+        resp, content = self.dump()
+        words = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+        self.assertEqual(sorted(Word.objects.values_list('term', flat=True)), [w['term'] for w in words])
+        self.assertIn('entries', words[0])
+        self.assertIn('ETag', resp)
+
+    def test_dump_by_id(self):
+        _, content = self.dump('/api/lexicons/1/dump/')
+        self.assertEqual(Word.objects.count(), len(content.splitlines()))
+
+    def test_dump_gzip(self):
+        _, plain = self.dump()
+        resp, content = self.dump(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual('gzip', resp['Content-Encoding'])
+        self.assertEqual(plain, gzip.decompress(content))
+
+    def test_dump_not_found(self):
+        resp = self.client.get('/api/lexicons/en-fr/dump.ndjson')
+        self.assertEqual(404, resp.status_code)
+
+    def test_dump_queries(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        # data version, words & entries prefetch plan (independent of the number of words)
+        with self.assertNumQueries(6):
+            self.dump()
+
+
+class BundleTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        settings = override_settings(LINGUATEC_LEXICON_BUNDLE_DIR=tmpdir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.bundle_dir = tmpdir.name
+
+    def build(self, *args):
+        call_command('buildbundle', 'es-ar', *args, stdout=StringIO())
+        lexicon = Lexicon.objects.get(pk=1)
+        return os.path.join(self.bundle_dir, 'es-ar-{}.sqlite3'.format(lexicon.data_version))
+
+    def test_build(self):
+        path = self.build()
+        db = sqlite3.connect(path)
+        self.addCleanup(db.close)
+        self.assertEqual(Word.objects.count(), db.execute('SELECT COUNT(*) FROM words').fetchone()[0])
+        self.assertEqual(Entry.objects.count(), db.execute('SELECT COUNT(*) FROM entries').fetchone()[0])
+        self.assertEqual(
+            [Word.objects.get(term='echar').pk],
+            [row[0] for row in db.execute("SELECT rowid FROM words_fts WHERE words_fts MATCH 'echar'")],
+        )
+
+    def test_rebuild_removes_old_bundles(self):
+        old_path = self.build()
+        Lexicon.objects.bump_data_version()
+        path = self.build('--keep', '0')
+        self.assertNotEqual(old_path, path)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(path))
+
+    def test_download(self):
+        path = self.build()
+        resp = self.client.get('/api/lexicons/es-ar/bundle/')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('bytes', resp['Accept-Ranges'])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b''.join(resp.streaming_content))
+
+        resp = self.client.get('/api/lexicons/es-ar/bundle/', HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(304, resp.status_code)
+
+    def test_download_range(self):
+        path = self.build()
+        etag = self.client.get('/api/lexicons/es-ar/bundle/')['ETag']
+        resp = self.client.get('/api/lexicons/es-ar/bundle/', HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=etag)
+        self.assertEqual(206, resp.status_code)
+        self.assertEqual('bytes 10-19/{}'.format(os.path.getsize(path)), resp['Content-Range'])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read()[10:20], b''.join(resp.streaming_content))
+
+        # bundle has changed: whole content
+        resp = self.client.get('/api/lexicons/es-ar/bundle/', HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"other"')
+        self.assertEqual(200, resp.status_code)
+
+        resp = self.client.get('/api/lexicons/es-ar/bundle/', HTTP_RANGE='bytes=100000000-')
+        self.assertEqual(416, resp.status_code)
+
+    def test_not_built(self):
+        self.assertEqual(404, self.client.get('/api/lexicons/es-ar/bundle/').status_code)
+        self.build()
+        self.assertEqual(404, self.client.get('/api/lexicons/es-ar/bundle/?v=1000').status_code)
+
+    def test_parse_byte_range(self):
+        self.assertEqual((0, 99), views.parse_byte_range('bytes=0-', 100))
+        self.assertEqual((90, 99), views.parse_byte_range('bytes=-10', 100))
+        self.assertEqual((10, 99), views.parse_byte_range('bytes=10-200', 100))
+        self.assertIsNone(views.parse_byte_range(None, 100))
+        self.assertIsNone(views.parse_byte_range('bytes=0-1,5-6', 100))
+        self.assertRaises(ValueError, views.parse_byte_range, 'bytes=100-', 100)
+
+
+class LookupTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def lookup(self, query):
+        resp = self.client.get('/api/words/lookup/?q={}&l=es-ar'.format(query))
+        self.assertEqual(200, resp.status_code)
+        resp_json = resp.json()
+        return resp_json["tier"], [word["term"] for word in resp_json["results"]]
+
+    def test_exact(self):
+        self.assertEqual(("exact", ["echar"]), self.lookup("Echar"))
+
+    def test_search(self):
+        Word.objects.create(term="echar a perder", lexicon_id=1)
+        self.assertEqual(("exact", ["echar"]), self.lookup("echar"))
+        self.assertEqual(("search", ["echar a perder"]), self.lookup("perder"))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_near(self):
+        tier, terms = self.lookup("ebria")
+        self.assertEqual("near", tier)
+        self.assertIn("ebrio", terms)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_not_found(self):
+        self.assertEqual((None, []), self.lookup("robot"))
+
+    def test_exact_queries(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        # data version, word & entries prefetch plan (search & near aren't run)
+        with self.assertNumQueries(6):
+            self.lookup("echar")
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_miss_queries(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        # data version, exact and a single trigram query for search & near
+        with self.assertNumQueries(3):
+            self.assertEqual("near", self.lookup("ebria")[0])
+        with self.assertNumQueries(3):
+            self.lookup("robot")
+
+
+class FlatSerializerTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        for word in Word.objects.all():
+            word.save()
+
+        entry = Entry.objects.filter(word__term='echar').first()
+        region = Region.objects.create(name="Ribagorza")
+        entry.variation = DiatopicVariation.objects.create(name="benasqués", abbreviation="Ben.", region=region)
+        entry.save()
+        Label.objects.create(name="familiar", lexicon_id=1).entries.add(entry)
+        VerbalConjugation.objects.create(
+            entry=entry, raw="conjug. IND. pres. echo, echas, echa, echamos, echáis, echan")
+
+    def get_pair(self, url):
+        nested = self.client.get(url).json()
+        with override_settings(LINGUATEC_LEXICON_FLAT_SERIALIZERS=True):
+            flat = self.client.get(url).json()
+        return nested, flat
+
+    def test_same_representation(self):
+        nested, flat = self.get_pair('/api/words/?limit=100')
+        self.assertEqual(4, len(nested['results']))
+        self.assertEqual(nested, flat)
+
+    def test_same_representation_staff(self):
+        user = User.objects.create_user(username="admin", password="secret", is_staff=True)
+        self.client.force_login(user)
+        nested, flat = self.get_pair('/api/words/{}/'.format(Word.objects.get(term='echar').pk))
+        self.assertIn('admin_panel_url', flat)
+        self.assertEqual(nested, flat)
+
+    def test_fast_renderer(self):
+        data = self.client.get('/api/words/').json()
+        self.assertEqual(data, json.loads(FastJSONRenderer().render(data)))
+        self.assertEqual(b'', FastJSONRenderer().render(None))
+
+    def test_benchserializers(self):
+        out = StringIO()
+        call_command('benchserializers', 'es-ar', '--repeat=1', stdout=out)
+        self.assertIn("FlatWordSerializer + FastJSONRenderer", out.getvalue())
+
+
+class ExampleSearchTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_search_examples(self):
+        resp = self.client.get('/api/examples/?q=Fera&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(1, resp_json["count"])
+        example = resp_json["results"][0]
+        self.assertIn("clis de luna", example["phrase"])
+        self.assertEqual("eclipsar", example["word"]["term"])
+        self.assertIn("clisar", example["entry"]["translation"])
+
+    def test_search_examples_whole_words(self):
+        resp = self.client.get('/api/examples/?q=ninon&l=es-ar')
+        self.assertEqual(0, resp.json()["count"])
+
+        resp = self.client.get('/api/examples/?q=ninona&l=en-zn')
+        self.assertEqual(0, resp.json()["count"])
+
+    def test_search_examples_invalid_lexicon(self):
+        resp = self.client.get('/api/examples/?q=casa&l=invalid')
+        self.assertEqual(400, resp.status_code)
+
+    def test_num_queries(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        # data version, count & examples (joined with entries and words)
+        with self.assertNumQueries(3):
+            self.client.get('/api/examples/?q=ej&l=es-ar')
+
+    def test_admin_search(self):
+        self.client.force_login(User.objects.create_superuser('admin'))
+        resp = self.client.get('/admin/linguatec_lexicon/example/?q=ninona')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, resp.context["cl"].result_count)
+
+
+class AutocompleteTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def get_terms(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(200, resp.status_code)
+        return [word["term"] for word in resp.json()["results"]]
+
+    def test_autocomplete(self):
+        self.assertEqual(["echar", "eclipsar"], self.get_terms('/api/words/autocomplete/?q=Ec&l=es-ar'))
+        self.assertEqual(["ebrio", "echar"], self.get_terms('/api/words/autocomplete/?q=e&l=es-ar&limit=2'))
+        self.assertEqual([], self.get_terms('/api/words/autocomplete/?q=foo&l=es-ar'))
+        self.assertEqual([], self.get_terms('/api/words/autocomplete/?q=&l=es-ar'))
+        self.assertEqual([], self.get_terms('/api/words/autocomplete/?q=e&l=en-zn'))
+
+    def test_words_not_queried(self):
+        self.get_terms('/api/words/autocomplete/?q=e&l=es-ar')
+        # only data version is retrieved
+        with self.assertNumQueries(1):
+            self.get_terms('/api/words/autocomplete/?q=ed&l=es-ar')
+
+    def test_index_rebuilt_on_data_version_change(self):
+        self.assertEqual(["edad"], self.get_terms('/api/words/autocomplete/?q=ed&l=es-ar'))
+        word = Word.objects.create(term="édito", lexicon_id=1)
+        RenderedWord.objects.rebuild(Word.objects.filter(pk=word.pk))
+        self.assertEqual(["edad", "édito"], self.get_terms('/api/words/autocomplete/?q=ed&l=es-ar'))
+
+    def test_invalid_lexicon(self):
+        resp = self.client.get('/api/words/autocomplete/?q=e&l=foo')
+        self.assertEqual(400, resp.status_code)
+
+
+@override_settings(LINGUATEC_LEXICON_RESPONSE_CACHE='default')
+class ResponseCacheTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        cache.clear()
+
+    def test_search_cached(self):
+        url = '/api/words/search/?q=echar&l=es-ar'
+        resp = self.client.get(url)
+        self.assertEqual('MISS', resp.headers['X-Cache'])
+
+        # only data version is retrieved
+        with self.assertNumQueries(1):
+            cached = self.client.get(url)
+        self.assertEqual('HIT', cached.headers['X-Cache'])
+        self.assertEqual(resp.json(), cached.json())
+        self.assertEqual(resp.headers['ETag'], cached.headers['ETag'])
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_query_normalized(self):
+        self.client.get('/api/words/near/?q=echar&l=es-ar')
+        resp = self.client.get('/api/words/near/?q=%20Échar&l=es-ar')
+        self.assertEqual('HIT', resp.headers['X-Cache'])
+
+    def test_invalidated_by_data_version(self):
+        url = '/api/words/exact/?q=echar&l=es-ar'
+        self.client.get(url)
+        RenderedWord.objects.rebuild(Word.objects.filter(term="echar"))
+        self.assertEqual('MISS', self.client.get(url).headers['X-Cache'])
+
+    def test_staff_not_shared(self):
+        url = '/api/words/search/?q=echar&l=es-ar'
+        self.client.get(url)
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        resp = self.client.get(url)
+        self.assertEqual('MISS', resp.headers['X-Cache'])
+        self.assertIn('admin_panel_url', resp.json()['results'][0])
+
+    @override_settings(LINGUATEC_LEXICON_RESPONSE_CACHE=None)
+    def test_disabled(self):
+        resp = self.client.get('/api/words/search/?q=echar&l=es-ar')
+        self.assertNotIn('X-Cache', resp.headers)
+
+    def test_cachestats_command(self):
+        url = '/api/words/search/?q=echar&l=es-ar'
+        self.client.get(url)
+        self.client.get(url)
+
+        out = StringIO()
+        call_command('cachestats', stdout=out)
+        self.assertIn("hits: 1 misses: 1", out.getvalue())
+
+
+@override_settings(LINGUATEC_LEXICON_RESPONSE_CACHE='default')
+class WarmCacheTestCase(TransactionTestCase):
+    # data should be committed to be visible by the threads of the command
+    available_apps = ['django.contrib.auth', 'django.contrib.contenttypes', 'linguatec_lexicon', 'tests']
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        cache.clear()
+        # calculate slugs (not included on fixtures)
+        for word in Word.objects.all():
+            word.save()
+
+    def test_warmcache(self):
+        out = StringIO()
+        call_command('warmcache', 'es-ar', '--base-url=http://testserver/', '--workers=2', '--allow-local-cache',
+                     stdout=out)
+        self.assertIn("Rendered 4 words", out.getvalue())
+        self.assertIn("Requested 8 queries", out.getvalue())
+        self.assertIn("8 cached, 0 already cached, 0 errors", out.getvalue())
+
+        resp = self.client.get('/api/words/search/?q=echar&l=es-ar')
+        self.assertEqual('HIT', resp.headers['X-Cache'])
+
+    def test_warmcache_terms_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv') as f:
+            f.write("echar\t20\nfoo\t10\nedad\t5\n")
+            f.flush()
+            out = StringIO()
+            call_command('warmcache', 'es-ar', terms_file=f.name, top=2, endpoints='exact',
+                         base_url='http://testserver/', allow_local_cache=True, stdout=out)
+        self.assertIn("Requested 2 queries", out.getvalue())
+        self.assertIn("1 errors", out.getvalue())
+
+    def test_warmcache_process_local_cache(self):
+        # tests use LocMemCache which isn't shared by the server processes
+        with self.assertRaisesMessage(CommandError, "local to this process"):
+            call_command('warmcache', 'es-ar', stdout=StringIO())
+
+
+class WordPaginationTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def get_all_pages(self, url):
+        terms = []
+        while url is not None:
+            resp = self.client.get(url)
+            self.assertEqual(200, resp.status_code)
+            resp_json = resp.json()
+            self.assertNotIn("count", resp_json)
+            terms += [word["term"] for word in resp_json["results"]]
+            url = resp_json["next"]
+        return terms
+
+    def test_word_list_cursor(self):
+        expected = [word["term"] for word in self.client.get('/api/words/?limit=100').json()["results"]]
+        self.assertEqual(expected, self.get_all_pages('/api/words/?pagination=cursor&limit=2'))
+
+    def test_word_list_cursor_skips_count(self):
+        # same queries than limit offset pagination but the COUNT
+        with self.assertNumQueries(6):
+            self.client.get('/api/words/?pagination=cursor')
+
+    def test_word_search_hasnext(self):
+        # same queries than limit offset pagination but the COUNT
+        Lexicon.objects.get_by_slug("es-ar")
+        with self.assertNumQueries(6):
+            resp = self.client.get('/api/words/search/?q=edad&l=es-ar&pagination=hasnext')
+        resp_json = resp.json()
+        self.assertNotIn("count", resp_json)
+        self.assertEqual(["edad"], [word["term"] for word in resp_json["results"]])
+        self.assertIsNone(resp_json["next"])
+
+    def test_word_list_hasnext(self):
+        expected = [word["term"] for word in self.client.get('/api/words/?limit=100').json()["results"]]
+        self.assertEqual(expected, self.get_all_pages('/api/words/?pagination=hasnext&limit=3'))
+
+    def test_unknown_pagination_uses_limit_offset(self):
+        resp = self.client.get('/api/words/?pagination=foo')
+        self.assertIn("count", resp.json())
+
+
 class LexiconAPITestCase(TestCase):
     fixtures = ['lexicon-sample.json']
 
@@ -91,6 +790,20 @@ class VerbsAPITestCase(TestCase):
                 self.assertIn('model_word_id', entry['conjugation'])
                 self.assertEqual(entry['conjugation']['model_word_id'], 4434)
 
+    def test_word_verb_parsed_conjugation(self):
+        expected = self.client.get('/api/words/8/').json()
+
+        call_command('parseconjugations', stdout=StringIO())
+        with self.assertNumQueries(6):
+            response = self.client.get('/api/words/8/').json()
+        self.assertEqual(expected, response)
+
+        with self.assertNumQueries(6):
+            response = self.client.get('/api/words/8546/').json()
+        for entry in response['entries']:
+            if 'capuzar' in entry['translation']:
+                self.assertEqual(entry['conjugation']['model_word_id'], 4434)
+
 
 class SearchTestCase(TestCase):
     fixtures = ['lexicons.json',
@@ -165,6 +878,19 @@ class NearWordTestCase(TestCase):
         self.assertEqual(200, resp.status_code)
         self.assertEqual(0, resp.json()["count"])
 
+    def test_cursor_pagination(self):
+        url = '/api/words/near/?q=bastar&l=es-ar'
+        expected = [word["term"] for word in self.client.get(url).json()["results"]]
+        self.assertGreater(len(expected), 1)
+
+        terms = []
+        url += '&pagination=cursor&limit=1'
+        while url is not None:
+            resp_json = self.client.get(url).json()
+            terms += [word["term"] for word in resp_json["results"]]
+            url = resp_json["next"]
+        self.assertEqual(expected, terms)
+
     def test_typo(self):
         query = "batsar"
         resp = self.client.get('/api/words/near/?q={}&l=es-ar'.format(query))
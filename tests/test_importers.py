@@ -1,13 +1,19 @@
 import os
+import tempfile
+import types
 from io import StringIO
 
+import pandas as pd
+import xlrd
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 
+from linguatec_lexicon.management.commands import importdata
 from linguatec_lexicon.models import (DiatopicVariation, Entry, Example,
-                                      GramaticalCategory, Lexicon, Region,
-                                      VerbalConjugation, Word)
+                                      GramaticalCategory, Label, Lexicon, Region,
+                                      RenderedWord, VerbalConjugation, Word,
+                                      WordToken)
 
 
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -51,16 +57,214 @@ class ImporterTestCase(TestCase):
 
         base_path = os.path.dirname(os.path.abspath(__file__))
         sample_path = os.path.join(base_path, 'fixtures/sample-input.xlsx')
+        data_version = Lexicon.objects.get_data_version()
         call_command('importdata', self.LEXICON_CODE, sample_path)
 
         self.assertEqual(NUMBER_OF_WORDS, Word.objects.count())
         self.assertEqual(NUMBER_OF_ENTRIES, Entry.objects.count())
         self.assertEqual(NUMBER_OF_EXAMPLES, Example.objects.count())
+        self.assertEqual(NUMBER_OF_WORDS, RenderedWord.objects.count())
+        self.assertNotEqual(data_version, Lexicon.objects.get_data_version())
 
         # TODO make a more depth comparation between
         # call_command('dumpdata', 'linguatec_lexicon', indent=4, output='/tmp/test-output.json')
         # and fixtures/sample-output.json
 
+    def test_import_relations(self):
+        rows = [
+            ["casa", "s. f.", "casa // caseta", "vivienda // vivienda", ""],
+            ["perro", "s. m.//s.m.", "can", "animal", "o can ladra"],
+            ["rojo", "adj.", "royo", "", ""],
+        ]
+        with tempfile.NamedTemporaryFile(suffix='.xlsx') as f:
+            pd.DataFrame(rows).to_excel(f.name, header=False, index=False)
+            out = StringIO()
+            call_command('importdata', self.LEXICON_CODE, f.name, batch_size=2, stdout=out)
+
+        self.assertIn("Imported: 3 words, 4 entries, 1 examples", out.getvalue())
+        self.assertEqual("o can ladra", Example.objects.get(entry__translation="can").normalized_phrase)
+        self.assertIn("Timings: words", out.getvalue())
+        self.assertEqual(
+            ["s. m."], list(Entry.objects.get(translation="can").gramcats.values_list('abbreviation', flat=True)))
+        self.assertEqual(4, Entry.gramcats.through.objects.count())
+        self.assertEqual(
+            {"vivienda": 2, "animal": 1},
+            {label.name: label.entries.count() for label in Label.objects.all()},
+        )
+
+    def import_rows(self, rows, **options):
+        with tempfile.NamedTemporaryFile(suffix='.xlsx') as f:
+            pd.DataFrame(rows).to_excel(f.name, header=False, index=False)
+            out = StringIO()
+            call_command('importdata', self.LEXICON_CODE, f.name, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_upsert(self):
+        self.import_rows([
+            ["casa", "s. f.", "casa // caseta", "vivienda", ""],
+            ["perro", "s. m.", "can // cadiello", "animal", "o can ladra"],
+            ["rojo", "adj.", "royo", "", ""],
+        ])
+        unchanged = Entry.objects.get(translation="casa")
+        unchanged.marked_translation = "*casa*"
+        unchanged.save()
+        lexicon = Lexicon.objects.get_by_slug(self.LEXICON_CODE)
+        version = Lexicon.objects.get(pk=lexicon.pk).data_version
+
+        output = self.import_rows([
+            ["casa", "s. f.", "casa // caseta", "vivienda", ""],
+            ["perro", "s. m.", "can", "animal", "o can ladra muito"],
+            ["rojo", "adj.", "royo", "", ""],
+            ["verde", "adj.", "verde", "", ""],
+        ], mode='upsert')
+
+        self.assertIn(
+            "Upserted: words 1 inserted, 1 updated, 2 unchanged, 0 deleted; "
+            "entries 1 inserted, 1 updated, 3 unchanged, 1 deleted; "
+            "examples 1 inserted, 1 deleted; conjugations 0 inserted, 0 deleted", output)
+        self.assertEqual("*casa*", Entry.objects.get(pk=unchanged.pk).marked_translation)
+        self.assertFalse(Entry.objects.filter(translation="cadiello").exists())
+        self.assertEqual(["o can ladra muito"], list(Example.objects.values_list('phrase', flat=True)))
+        self.assertEqual(["adj."], list(
+            Entry.objects.get(translation="verde").gramcats.values_list('abbreviation', flat=True)))
+        self.assertEqual(4, RenderedWord.objects.count())
+        self.assertEqual(version + 1, Lexicon.objects.get(pk=lexicon.pk).data_version)
+
+        # nothing is written if the file hasn't been changed
+        output = self.import_rows([
+            ["casa", "s. f.", "casa // caseta", "vivienda", ""],
+            ["perro", "s. m.", "can", "animal", "o can ladra muito"],
+            ["rojo", "adj.", "royo", "", ""],
+            ["verde", "adj.", "verde", "", ""],
+        ], mode='upsert')
+        self.assertIn("words 0 inserted, 0 updated, 4 unchanged, 0 deleted; "
+                      "entries 0 inserted, 0 updated, 5 unchanged, 0 deleted", output)
+        self.assertEqual(version + 1, Lexicon.objects.get(pk=lexicon.pk).data_version)
+
+    def test_import_upsert_same_translation_different_gramcat(self):
+        sample_path = os.path.join(BASE_PATH, 'fixtures/sample-same-translation-different-gramcat.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path, stdout=StringIO())
+        entry_ids = set(Entry.objects.values_list('pk', flat=True))
+
+        out = StringIO()
+        call_command('importdata', self.LEXICON_CODE, sample_path, mode='upsert', stdout=out)
+
+        self.assertIn("entries 0 inserted, 0 updated, {} unchanged, 0 deleted".format(len(entry_ids)), out.getvalue())
+        self.assertEqual(entry_ids, set(Entry.objects.values_list('pk', flat=True)))
+
+    def test_import_upsert_same_translation_changed_gramcat(self):
+        self.import_rows([
+            ["bajo", "adj.", "baixo", "", ""],
+            ["bajo", "prep.", "baixo", "", ""],
+        ])
+        entry_ids = set(Entry.objects.values_list('pk', flat=True))
+
+        output = self.import_rows([
+            ["bajo", "prep.", "baixo", "", ""],
+            ["bajo", "adv.", "baixo", "", ""],
+        ], mode='upsert')
+
+        self.assertIn("entries 0 inserted, 1 updated, 1 unchanged, 0 deleted", output)
+        self.assertEqual(entry_ids, set(Entry.objects.values_list('pk', flat=True)))
+        gramcats = Entry.gramcats.through.objects.values_list('gramaticalcategory__abbreviation', flat=True)
+        self.assertEqual({"adv.", "prep."}, set(gramcats))
+
+    def test_import_upsert_delete_missing(self):
+        self.import_rows([
+            ["casa", "s. f.", "casa", "vivienda", ""],
+            ["perro", "s. m.", "can", "animal", "o can ladra"],
+        ])
+        output = self.import_rows([
+            ["casa", "s. m.", "casa", "", ""],
+        ], mode='upsert', delete_missing=True)
+
+        self.assertIn("words 0 inserted, 1 updated, 0 unchanged, 1 deleted", output)
+        self.assertEqual(["casa"], list(Word.objects.values_list('term', flat=True)))
+        entry = Entry.objects.get()
+        self.assertEqual(["s. m."], list(entry.gramcats.values_list('abbreviation', flat=True)))
+        self.assertFalse(entry.labels.exists())
+        self.assertEqual(0, Example.objects.count())
+
+    def test_import_delete_missing_requires_upsert(self):
+        with self.assertRaises(CommandError):
+            self.import_rows([["casa", "s. f.", "casa", "", ""]], delete_missing=True)
+
+    def test_import_copy_loader(self):
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        sample_path = os.path.join(base_path, 'fixtures/sample-input.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path, loader='copy', stdout=StringIO())
+
+        self.assertEqual(12, Word.objects.count())
+        self.assertEqual(16, Entry.objects.count())
+        self.assertEqual(2, Example.objects.count())
+        self.assertEqual(12, RenderedWord.objects.count())
+        self.assertTrue(WordToken.objects.filter(token="edad").exists())
+        entry = Entry.objects.get(word__term="edad", translation="edá")
+        self.assertEqual(["s. m."], list(entry.gramcats.values_list('abbreviation', flat=True)))
+        self.assertEqual("eda", entry.normalized_translation)
+        example = Example.objects.get(entry__translation="tiempo")
+        self.assertEqual("¿que tiempo tiene ixa ninona?", example.normalized_phrase)
+
+        # new objects get following primary keys
+        word = Word.objects.create(term="zzz", lexicon=Lexicon.objects.get_by_slug(self.LEXICON_CODE))
+        self.assertGreater(word.pk, max(Word.objects.exclude(pk=word.pk).values_list('pk', flat=True)))
+
+    def test_import_copy_loader_conjugation(self):
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        sample_path = os.path.join(base_path, 'fixtures/verbal-conjugation.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path, loader='copy', stdout=StringIO())
+
+        conjugation = Entry.objects.get(word__term="abarcar", translation__contains="adubir").conjugation
+        self.assertIsNotNone(conjugation.parsed)
+        self.assertIsNotNone(conjugation.conjugation)
+
+    def test_benchimport(self):
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        sample_path = os.path.join(base_path, 'fixtures/sample-input.xlsx')
+        out = StringIO()
+        call_command('benchimport', self.LEXICON_CODE, sample_path, stdout=out)
+
+        self.assertIn("orm loader", out.getvalue())
+        self.assertIn("copy loader", out.getvalue())
+        # imported data is rolled back
+        self.assertEqual(0, Word.objects.count())
+
+    def test_read_input_file(self):
+        command = importdata.Command()
+        command.input_file = os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx')
+        rows = command.read_input_file()
+
+        # rows are read as they are consumed (empty rows are skipped)
+        self.assertIsInstance(rows, types.GeneratorType)
+        sheet = next(rows)[0][0]
+        self.assertEqual(((sheet, 2), 'echar', 'v.'), next(rows)[:3])
+        self.assertEqual(12, 2 + len(list(rows)))
+
+    def test_xls_cell_value(self):
+        # legacy .xls files are read by xlrd
+        self.assertIsNone(importdata.xls_cell_value(xlrd.sheet.Cell(xlrd.XL_CELL_EMPTY, '')))
+        self.assertEqual(2, importdata.xls_cell_value(xlrd.sheet.Cell(xlrd.XL_CELL_NUMBER, 2.0)))
+        self.assertEqual(2.5, importdata.xls_cell_value(xlrd.sheet.Cell(xlrd.XL_CELL_NUMBER, 2.5)))
+        self.assertEqual('casa', importdata.xls_cell_value(xlrd.sheet.Cell(xlrd.XL_CELL_TEXT, 'casa')))
+
+    def test_errors_are_written_as_detected(self):
+        out = StringIO()
+        command = importdata.Command(stdout=out)
+        command.verbosity = 2
+        command.allow_partial = False
+        command.lexicon = Lexicon.objects.get_by_slug(self.LEXICON_CODE)
+
+        def rows():
+            yield (('A', 1), 'casa', 's. f.', 'casa', '', '', '')
+            yield (('A', 2), 'perro', 'foo.', 'can', '', '', '')
+            # the error has been written before reading following rows
+            self.assertIn('"row": 2', out.getvalue())
+            yield (('B', 1), 'rojo', '', 'royo', '', '', '')
+
+        command.populate_models(rows())
+        self.assertEqual([('A', 2), ('B', 1)], [(error['sheet'], error['row']) for error in command.errors])
+        self.assertIn('"sheet": "B", "row": 1, "word": "rojo"', out.getvalue())
+
     def test_missing_letters_as_sheets(self):
         NUMBER_OF_WORDS = 4
 
@@ -135,6 +339,8 @@ class ImporterTestCase(TestCase):
                                                             dst_language=self.LEXICON_CODE[3:]))
         entry = word.entries.get(translation__contains="adubir")
         self.assertIsNotNone(entry.conjugation)
+        # stored parsed (bulk inserted without calling save)
+        self.assertIsNotNone(entry.conjugation.parsed)
 
     def test_word_with_partial_verbal_conjugation(self):
         NUMBER_OF_WORDS = 3
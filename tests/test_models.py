@@ -1,12 +1,16 @@
 import os
 import unittest
+from io import StringIO
 
+from django.core.cache import cache
 from django.core.management import call_command
 from django.db import IntegrityError, connection
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from linguatec_lexicon import utils
 from linguatec_lexicon.models import (DiatopicVariation, Entry,
-                                      GramaticalCategory, Lexicon, Region,
+                                      GramaticalCategory, Lexicon,
+                                      LexiconCache, Region,
                                       VerbalConjugation, Word,
                                       annotate_words_slug)
 
@@ -137,6 +141,38 @@ class VerbalConjugationModelTestCase(TestCase):
         self.assertIn("model", parsed_conjugation)
         self.assertIn("trobar", parsed_conjugation["model"])
 
+    def test_imported_conjugation_is_stored_parsed(self):
+        word = Word.objects.get(term="abarcar", lexicon=self.lexicon)
+        conjugation = word.entries.get(translation__contains="adubir").conjugation
+        self.assertIsNotNone(conjugation.parsed)
+        self.assertEqual(conjugation.parse_raw, conjugation.parsed)
+        self.assertEqual(list(conjugation.parse_raw["conjugation"]), list(conjugation.conjugation))
+
+    def test_imported_model_is_linked_to_model_word(self):
+        word = Word.objects.get(term="zambullir", lexicon=self.lexicon)
+        conjugation = word.entries.get(translation__contains="capuzar").conjugation
+        self.assertEqual("trobar", conjugation.model)
+        # model word "hallar" is not included on the imported file
+        self.assertIsNone(conjugation.model_word_ref)
+        self.assertIsNone(conjugation.model_word_id)
+
+        hallar = Word.objects.create(term="hallar", lexicon=self.lexicon)
+        # unlinked model word is looked up until conjugations are parsed again
+        self.assertEqual(hallar.pk, conjugation.model_word_id)
+        call_command('parseconjugations', stdout=StringIO())
+        conjugation.refresh_from_db()
+        self.assertEqual(hallar.pk, conjugation.model_word_ref_id)
+        self.assertEqual(hallar.pk, conjugation.model_word_id)
+
+    def test_changed_raw_is_parsed_on_save(self):
+        word = Word.objects.get(term="zambullir", lexicon=self.lexicon)
+        conjugation = VerbalConjugation.objects.get(entry__word=word)
+        conjugation.raw = "zambullir modelo. conjug. muyir (ordeñar)"
+        conjugation.save()
+
+        conjugation = VerbalConjugation.objects.get(pk=conjugation.pk)
+        self.assertEqual("ordeñar", conjugation.parsed["model_word"])
+
     def test_extract_verbal_model_2(self):
         v = VerbalConjugation(raw='atrebuyir modelo. conjug. muyir (ordeñar)')
         parsed_conjugation = v.parse_raw
@@ -163,6 +199,45 @@ class VerbalConjugationModelTestCase(TestCase):
         self.assertEqual(v.raw, parsed_conjugation["intro"])
 
 
+class LexiconCacheTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_get_by_slug_is_cached(self):
+        lexicon = Lexicon.objects.get_by_slug("es-ar")
+        with self.assertNumQueries(0):
+            self.assertEqual(lexicon, Lexicon.objects.get_by_slug("es-ar"))
+            self.assertEqual(lexicon, Lexicon.objects.get_by_id(lexicon.pk))
+
+    def test_invalidated_on_save(self):
+        lexicon = Lexicon.objects.get_by_slug("es-ar")
+        lexicon.name = "Spanish-Aragonese"
+        lexicon.save()
+        self.assertEqual("Spanish-Aragonese", Lexicon.objects.get_by_slug("es-ar").name)
+
+    def test_invalidated_on_delete(self):
+        Lexicon.objects.get_by_slug("es-ar").delete()
+        with self.assertRaises(Lexicon.DoesNotExist):
+            Lexicon.objects.get_by_slug("es-ar")
+
+    def test_invalidated_by_other_process(self):
+        lexicon = Lexicon.objects.get_by_slug("es-ar")
+        # other process updates the version shared using Django cache
+        cache.set(LexiconCache.VERSION_KEY, "other")
+        self.assertIsNot(lexicon, Lexicon.objects.get_by_slug("es-ar"))
+
+    @override_settings(LINGUATEC_LEXICON_LEXICON_CACHE=None)
+    def test_disabled_without_shared_cache(self):
+        Lexicon.objects.get_by_slug("es-ar")
+        with self.assertNumQueries(1):
+            Lexicon.objects.get_by_slug("es-ar")
+
+    def test_word_calculate_slug(self):
+        word = Word.objects.get(term="echar")
+        Lexicon.objects.get_by_id(word.lexicon_id)
+        with self.assertNumQueries(0):
+            self.assertEqual(utils.calculate_slug("es-ar", "echar"), word.calculate_slug())
+
+
 class WordManagerTestCase(TestCase):
     fixtures = ['lexicon-sample.json']
 
@@ -188,11 +263,91 @@ class WordManagerTestCase(TestCase):
         result = Word.objects.search("hacer", "es-ar")
         self.assertEqual(result[0].term, "hacer")
 
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_near_sorted(self):
+        result = Word.objects.search_near("ebria", "es-ar")
+        self.assertEqual("ebrio", result[0].term)
+        similarities = [word.similarity for word in result]
+        self.assertEqual(sorted(similarities, reverse=True), similarities)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_thresholds_independent_of_evaluation_order(self):
+        Word.objects.bulk_create([Word(lexicon_id=1, term="casas rurales"), Word(lexicon_id=1, term="casa")])
+        near = Word.objects.search_near("casa", "es-ar")
+        search = Word.objects.search("casa", "es-ar")
+
+        # similarity of "casas rurales" is between both thresholds
+        self.assertIn("casas rurales", [word.term for word in near])
+        self.assertEqual(["casa"], [word.term for word in search])
+        self.assertTrue(all(word.similarity >= 0.3 for word in Word.objects.search("casa", "es-ar")))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_near_uses_trigram_operator(self):
+        sql = str(Word.objects.search_near("ebria", "es-ar").query)
+        self.assertIn('"normalized_term" % ', sql)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_term_trigram_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Word._meta.db_table)
+        self.assertEqual("gin", constraints["word-lexicon-normalized-trgm"]["type"])
+
+    def test_search_ignores_accents_and_case(self):
+        Word.objects.create(lexicon_id=1, term="Aragonés")
+        result = Word.objects.search("ARAGONES", "es-ar")
+        self.assertEqual(["Aragonés"], [word.term for word in result])
+
+    def test_normalized_term_updated_on_save(self):
+        word = Word.objects.get(term="echar")
+        self.assertEqual("echar", word.normalized_term)
+
+        word.term = "Echar a perdér"
+        word.save(update_fields=["term"])
+        word.refresh_from_db()
+        self.assertEqual("echar a perder", word.normalized_term)
+
+    def test_normalizeterms_command(self):
+        Word.objects.filter(term="echar").update(term="Échar")
+        out = StringIO()
+        call_command('normalizeterms', stdout=out)
+        self.assertIn("Lexicon es-ar normalized", out.getvalue())
+        self.assertEqual("echar", Word.objects.get(term="Échar").normalized_term)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_translation_trigram_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Entry._meta.db_table)
+        self.assertEqual("gin", constraints["entry-translation-trgm"]["type"])
+
+    def test_search_by_translation(self):
+        result = Word.objects.search_by_translation("Aventar", "es-ar")
+        self.assertEqual(["echar"], [word.term for word in result])
+
     def test_search_query_unbalanced_parenthesis(self):
         result = Word.objects.search("largo(a", "es-ar")
         self.assertEqual(0, result.count())
 
 
+class WordTokenTest(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_tokens_updated_on_save(self):
+        word = Word.objects.get(term="echar")
+        self.assertEqual({"echar"}, set(word.tokens.values_list("token", flat=True)))
+
+        word.term = "echar a perder"
+        word.save()
+        self.assertEqual({"echar", "a", "perder"}, set(word.tokens.values_list("token", flat=True)))
+
+    def test_tokens_created_on_bulk_create(self):
+        words = Word.objects.bulk_create([Word(lexicon_id=1, term="hacer acopio")])
+        self.assertEqual({"hacer", "acopio"}, set(words[0].tokens.values_list("token", flat=True)))
+
+    def test_search_filters_by_token(self):
+        sql = str(Word.objects.search("echar a", "es-ar").query)
+        self.assertIn('"linguatec_lexicon_wordtoken"."token" = echar', sql)
+
+
 class WordSlugTest(TestCase):
     fixtures = ['lexicon-sample.json']
 
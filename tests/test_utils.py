@@ -18,3 +18,13 @@ class UtilsTest(TestCase):
 
     def test_invalid_missing_dest_language_code(self):
         self.assertRaises(ValueError, utils.get_lexicon_languages_from_code, "foo-")
+
+    def test_tokenize(self):
+        self.assertEqual({"echar", "a", "perder"}, utils.tokenize("Echar a perder"))
+        self.assertEqual({"largo", "a"}, utils.tokenize("largo/a"))
+        self.assertEqual({"atencion"}, utils.tokenize("¡Atención!"))
+
+    def test_normalize(self):
+        self.assertEqual("aragones", utils.normalize("Aragonés"))
+        self.assertEqual("nino", utils.normalize("NIÑO"))
+        self.assertEqual("pinguino", utils.normalize("pingüino"))